@@ -0,0 +1,142 @@
+"""End-to-end benchmark of WindowOrganiser on the simulated desktop.
+
+Runs the real window-organiser.pyw organiser (engine, launcher, matcher,
+placement batcher, notifier) against SimulatedBackend for layouts of 8, 50
+and 200 windows. Each layout mixes already-open windows, launched apps with
+log-normal launch latencies, titles that change after launch, duplicate
+titles, windows that snap back after a move and launches that fail. Runs
+in a scratch directory, so logs, traces and launch history start cold.
+
+    python benchmarks/e2e_bench.py [--sizes 8 50 200] [--time-scale 0.5] [--events] [--json]
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from organiser.notifier import StubNotifierBackend
+from organiser.simulated import SimulatedApp, SimulatedBackend, lognormal
+from organiser.watcher import FakeEventSource
+
+
+def load_organiser_module():
+    """Import window-organiser.pyw (not importable by name because of the hyphen)"""
+    path = os.path.join(ROOT, "window-organiser.pyw")
+    loader = importlib.machinery.SourceFileLoader("window_organiser", path)
+    spec = importlib.util.spec_from_loader("window_organiser", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def build_layout(size, time_scale, seed):
+    """A desktop and a window_config.json-style layout with ``size`` windows"""
+    rng = random.Random(seed)
+    backend = SimulatedBackend(seed=seed)
+    configs = {}
+    for i in range(size):
+        title = f"App {i}"
+        config = {"x": (i % 4) * 480, "y": (i // 4 % 4) * 270, "width": 480, "height": 270, "app_name": f"app{i}"}
+        latency = lognormal(0.4 * time_scale, 0.6)
+        roll = rng.random()
+        if roll < 0.40:
+            backend.add_window(title)
+        elif roll < 0.80:
+            backend.add_app(f"app{i}", SimulatedApp(title, latency))
+        elif roll < 0.85:
+            backend.add_app(f"app{i}", SimulatedApp("Loading...", latency, final_title=title,
+                                                    rename_after=0.3 * time_scale))
+        elif roll < 0.90:
+            backend.add_app(f"app{i}", SimulatedApp(title, latency, windows=2))
+        elif roll < 0.95:
+            backend.add_app(f"app{i}", SimulatedApp(title, latency, snap_back=1))
+        else:
+            backend.add_app(f"app{i}", SimulatedApp(title, latency, failure=rng.choice(["error", "hang"])))
+        configs[title] = config
+    return backend, configs
+
+
+def run_layout(module, size, args):
+    backend, configs = build_layout(size, args.time_scale, args.seed)
+    with open("window_config.json", 'w', encoding='utf-8') as f:
+        json.dump(configs, f)
+    notifier_backend = StubNotifierBackend()
+    organiser = module.WindowOrganiser(max_workers=args.max_workers, backend=backend,
+                                       notifier_backend=notifier_backend)
+    engine = organiser.engine
+    engine.LAUNCH_WAIT = args.launch_wait
+    if args.events:
+        engine.event_source = backend.event_source = FakeEventSource()
+    calls_before = backend.native_calls
+
+    start = time.perf_counter()
+    results = organiser.organize()
+    wall = time.perf_counter() - start
+    organiser.notifier.close(1)
+
+    return {
+        "windows": size,
+        "wall_s": round(wall, 3),
+        "placed": sum(1 for result in results if result.success),
+        "enumerations": engine.index.enumerations,
+        "wait_sleeps": engine.waits,
+        "coalesce_sleeps": engine.placer.batches,
+        "settle_sleeps": engine.placer.settles,
+        "native_calls": backend.native_calls - calls_before,
+        "calls": dict(backend.calls),
+        "toasts": len(notifier_backend.shown),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 50, 200])
+    parser.add_argument("--time-scale", type=float, default=0.5,
+                        help="Multiplier for simulated launch latencies (default: 0.5)")
+    parser.add_argument("--launch-wait", type=float, default=2.0,
+                        help="Seconds to wait for a launched window without history (default: 2)")
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--events", action="store_true", help="Report windows through simulated WinEvent hooks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per layout")
+    args = parser.parse_args()
+
+    reports = []
+    with tempfile.TemporaryDirectory() as scratch:
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            module = load_organiser_module()
+            try:
+                for size in args.sizes:
+                    os.makedirs(str(size))
+                    os.chdir(str(size))
+                    reports.append(run_layout(module, size, args))
+                    os.chdir(scratch)
+            finally:
+                module.log.close()  # Release the log file before the scratch directory goes
+        finally:
+            os.chdir(cwd)
+
+    if args.json:
+        for report in reports:
+            print(json.dumps(report))
+        return
+    mode = "window events" if args.events else "polling"
+    print(f"WindowOrganiser on the simulated desktop ({mode}, latency scale {args.time_scale})")
+    print(f"{'windows':>8} {'wall s':>8} {'placed':>8} {'enums':>7} {'waits':>7} {'coalesce':>9} {'settle':>7} {'native':>8} {'toasts':>7}")
+    for r in reports:
+        print(f"{r['windows']:>8} {r['wall_s']:>8.3f} {r['placed']:>8} {r['enumerations']:>7} {r['wait_sleeps']:>7} "
+              f"{r['coalesce_sleeps']:>9} {r['settle_sleeps']:>7} {r['native_calls']:>8} {r['toasts']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Cold-start benchmark for the organiser's login path, with a regression budget.
+
+Starts a fresh interpreter that loads window-organiser.pyw itself, then
+has its WindowOrganiser organise already-open windows on the simulated
+desktop (with toasts recorded instead of shown).
+Reports interpreter + import time and the time until the first window is
+positioned, and fails (exit status 1) when either exceeds its budget or a
+module that should load lazily shows up at startup.
+
+    python benchmarks/startup_bench.py [--runs 5] [--import-budget-ms 150] [--first-position-budget-ms 600]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must stay off the startup path: loaded only by the code that needs them
+LAZY_MODULES = ("AppOpener", "win10toast", "pygetwindow", "tkinter", "difflib", "socketserver",
+                "subprocess", "tempfile", "sqlite3", "organiser.daemon", "organiser.app_index")
+
+CHILD = r"""
+import json, sys, time
+started = time.time()
+sys.path.insert(0, {root!r})
+import importlib.machinery, importlib.util
+loader = importlib.machinery.SourceFileLoader("window_organiser", {script!r})
+spec = importlib.util.spec_from_loader("window_organiser", loader)
+module = importlib.util.module_from_spec(spec)
+loader.exec_module(module)
+imported = time.time()
+lazy = [name for name in {lazy!r} if name in sys.modules]
+
+from organiser.notifier import StubNotifierBackend
+from organiser.simulated import SimulatedBackend
+backend = SimulatedBackend()
+for i in range({windows}):
+    backend.add_window(f"App {{i}}")
+organiser = module.WindowOrganiser(backend=backend, notifier_backend=StubNotifierBackend())
+organiser.organize()
+first_position = time.time() - (time.monotonic() - organiser.engine.placer.first_applied_at)
+organiser.notifier.close(1)
+module.log.close()
+print(json.dumps({{"started": started, "imported": imported, "first_position": first_position, "lazy": lazy}}))
+"""
+
+
+def measure(windows):
+    """One cold start of window-organiser.pyw in a scratch directory holding its config"""
+    configs = {f"App {i}": {"x": i, "y": 0, "width": 800, "height": 600, "app_name": f"app{i}", "position_only": True}
+               for i in range(windows)}
+    code = CHILD.format(root=ROOT, script=os.path.join(ROOT, "window-organiser.pyw"), lazy=LAZY_MODULES,
+                        windows=windows)
+    with tempfile.TemporaryDirectory() as scratch:
+        with open(os.path.join(scratch, "window_config.json"), 'w', encoding='utf-8') as f:
+            json.dump(configs, f)
+        launched = time.time()
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=scratch).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return {
+        "import_ms": (result["imported"] - launched) * 1e3,
+        "first_position_ms": (result["first_position"] - launched) * 1e3,
+        "lazy": result["lazy"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--windows", type=int, default=8)
+    parser.add_argument("--import-budget-ms", type=float, default=150,
+                        help="Budget for interpreter start + startup imports (median)")
+    parser.add_argument("--first-position-budget-ms", type=float, default=600,
+                        help="Budget for process start to first window positioned (median)")
+    args = parser.parse_args()
+
+    runs = [measure(args.windows) for _ in range(args.runs)]
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    first_position_ms = statistics.median(run["first_position_ms"] for run in runs)
+    eager = sorted(set(name for run in runs for name in run["lazy"]))
+
+    print(f"Cold start over {args.runs} runs ({args.windows} open windows, median)")
+    print(f"  interpreter + imports:   {import_ms:8.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"  first window positioned: {first_position_ms:8.1f} ms (budget {args.first_position_budget_ms:.0f} ms)")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"imports took {import_ms:.1f} ms")
+    if first_position_ms > args.first_position_budget_ms:
+        failures.append(f"first window positioned after {first_position_ms:.1f} ms")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
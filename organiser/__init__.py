@@ -0,0 +1 @@
+"""Shared building blocks for window-organiser.pyw and the config GUI."""
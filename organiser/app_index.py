@@ -0,0 +1,167 @@
+import bisect
+import difflib
+import importlib.util
+import json
+import os
+import threading
+
+from organiser.json_file import write_json
+
+
+UNINSTALL_KEYS = (
+    "Software\\Wow6432Node\\Microsoft\\Windows\\CurrentVersion\\Uninstall",
+    "Software\\Microsoft\\Windows\\CurrentVersion\\Uninstall",
+)
+
+APP_DIRECTORIES = (
+    "%LOCALAPPDATA%\\Programs",
+    "%PROGRAMFILES%",
+    "%PROGRAMFILES(X86)%",
+    "%LOCALAPPDATA%\\Microsoft\\WindowsApps",
+)
+
+
+def default_fingerprint(extra_paths=()):
+    """Cheap summary of everything the installed-app scan reads.
+
+    Combines the last-write times of the registry Uninstall keys, the mtimes
+    of the scanned install directories and of AppOpener's catalogue. Any
+    install or uninstall changes at least one of them.
+    """
+    parts = []
+    try:
+        import winreg
+        for key_path in UNINSTALL_KEYS:
+            try:
+                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                    parts.append(f"{key_path}={winreg.QueryInfoKey(key)[2]}")
+            except OSError:
+                parts.append(f"{key_path}=missing")
+    except ImportError:
+        pass
+    paths = [os.path.expandvars(path) for path in APP_DIRECTORIES]
+    spec = importlib.util.find_spec("AppOpener")
+    if spec and spec.origin:
+        paths.append(os.path.join(os.path.dirname(spec.origin), "Data", "data.json"))
+    paths.extend(extra_paths)
+    for path in paths:
+        try:
+            parts.append(f"{path}={os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{path}=missing")
+    return "|".join(parts)
+
+
+class AppIndex:
+    """On-disk index of installed app names with prefix and fuzzy lookup.
+
+    ``load`` returns the last scan instantly; ``refresh_async`` re-runs
+    ``scan`` on a background thread only when ``fingerprint`` has changed
+    (or when forced) and reports the new list through ``on_done``. Names
+    given to ``merge`` (e.g. from the user's configs) are listed alongside
+    the scan but never cached, so they don't invalidate it.
+    """
+
+    def __init__(self, scan, path="app_index.json", fingerprint=default_fingerprint, logger=None):
+        self.scan = scan
+        self.path = path
+        self.fingerprint = fingerprint
+        self.logger = logger
+        self.stored_fingerprint = None
+        self.refreshing = False
+        self.extra = ()
+        self._set_apps([])
+        self._lock = threading.Lock()
+
+    def _set_apps(self, scanned):
+        self.scanned = list(scanned)
+        apps = sorted(set(app for app in self.scanned + list(self.extra) if app), key=str.lower)
+        self.apps = apps
+        self._lowered = [app.lower() for app in apps]
+        self._by_lower = dict(zip(self._lowered, apps))
+
+    def __len__(self):
+        return len(self.apps)
+
+    def merge(self, names):
+        """List ``names`` with the scanned apps from now on, replacing the previous merge"""
+        with self._lock:
+            self.extra = tuple(names)
+            self._set_apps(self.scanned)
+
+    def load(self):
+        """Load the cached index; returns True if there was one"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._set_apps(data.get("apps", []))
+                self.stored_fingerprint = data.get("fingerprint")
+                return True
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not load app index from {self.path}: {e}")
+        return False
+
+    def save(self, fingerprint):
+        try:
+            write_json(self.path, {"fingerprint": fingerprint, "apps": self.scanned})
+            self.stored_fingerprint = fingerprint
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not save app index to {self.path}: {e}")
+
+    def refresh(self, force=False):
+        """Rescan if the fingerprint changed; returns True if the app list was rebuilt"""
+        fingerprint = self.fingerprint()
+        if not force and self.scanned and fingerprint == self.stored_fingerprint:
+            return False
+        apps = self.scan()
+        with self._lock:
+            self._set_apps(apps)
+            self.save(fingerprint)
+        return True
+
+    def refresh_async(self, on_done, force=False):
+        """Refresh on a background thread and call ``on_done(changed)`` from it"""
+        if self.refreshing:
+            return
+
+        def worker():
+            changed = False
+            try:
+                changed = self.refresh(force)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"App index refresh failed: {e}")
+            finally:
+                self.refreshing = False
+            on_done(changed)
+
+        self.refreshing = True
+        threading.Thread(target=worker, name="app-index-refresh", daemon=True).start()
+
+    def prefix(self, query, limit=20):
+        """Apps whose name starts with ``query`` (case-insensitive)"""
+        query = query.lower()
+        lowered = self._lowered
+        start = bisect.bisect_left(lowered, query)
+        matches = []
+        for name in lowered[start:start + limit]:
+            if not name.startswith(query):
+                break
+            matches.append(self._by_lower[name])
+        return matches
+
+    def fuzzy(self, query, limit=5, cutoff=0.6):
+        """Closest app names to ``query``, best first"""
+        names = difflib.get_close_matches(query.lower(), self._lowered, n=limit, cutoff=cutoff)
+        return [self._by_lower[name] for name in names]
+
+    def lookup(self, query):
+        """Exact (case-insensitive) match, else first prefix match, else best fuzzy match"""
+        exact = self._by_lower.get(query.lower())
+        if exact:
+            return exact
+        matches = self.prefix(query, limit=1) or self.fuzzy(query, limit=1)
+        return matches[0] if matches else None
@@ -0,0 +1,67 @@
+def hungarian(cost):
+    """Minimum-cost assignment for a rectangular cost matrix (list of rows).
+
+    Returns ``(row, column)`` pairs; every row is assigned when there are no
+    more rows than columns, otherwise every column is. Runs in O(n^2 m)
+    using the shortest augmenting path formulation with potentials.
+    """
+    if not cost or not cost[0]:
+        return []
+    if len(cost) > len(cost[0]):
+        transposed = [list(column) for column in zip(*cost)]
+        return [(row, column) for column, row in hungarian(transposed)]
+
+    rows, columns = len(cost), len(cost[0])
+    infinity = float("inf")
+    # 1-based arrays; column 0 is a virtual column holding the row being inserted
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    owner = [0] * (columns + 1)
+    way = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column0 = 0
+        min_to = [infinity] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column0] = True
+            row0 = owner[column0]
+            delta = infinity
+            column1 = 0
+            for column in range(1, columns + 1):
+                if used[column]:
+                    continue
+                reduced = cost[row0 - 1][column - 1] - u[row0] - v[column]
+                if reduced < min_to[column]:
+                    min_to[column] = reduced
+                    way[column] = column0
+                if min_to[column] < delta:
+                    delta = min_to[column]
+                    column1 = column
+            for column in range(columns + 1):
+                if used[column]:
+                    u[owner[column]] += delta
+                    v[column] -= delta
+                else:
+                    min_to[column] -= delta
+            column0 = column1
+            if owner[column0] == 0:
+                break
+        while column0:
+            column1 = way[column0]
+            owner[column0] = owner[column1]
+            column0 = column1
+    return sorted((owner[column] - 1, column - 1) for column in range(1, columns + 1) if owner[column])
+
+
+def placement_cost(rect, slot):
+    """How far a window at ``rect`` (left, top, width, height) has to move and resize to fill ``slot``"""
+    left, top, width, height = rect
+    return (abs(left - slot["x"]) + abs(top - slot["y"])
+            + abs(width - slot["width"]) + abs(height - slot["height"]))
+
+
+def assign_slots(rects, slots):
+    """Map window indices to slot indices so the total movement is as small as possible"""
+    cost = [[placement_cost(rect, slot) for slot in slots] for rect in rects]
+    return dict(hungarian(cost))
@@ -0,0 +1,241 @@
+import json
+import os
+import re
+
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+SWP_NOOWNERZORDER = 0x0200
+PLACEMENT_FLAGS = SWP_NOZORDER | SWP_NOACTIVATE | SWP_NOOWNERZORDER
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+TH32CS_SNAPPROCESS = 0x00000002
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+SM_CMONITORS = 80
+MAX_PATH_LENGTH = 32768
+
+
+class PyGetWindowBackend:
+    """Real desktop backend built on pygetwindow, AppOpener and the shell"""
+
+    APPS_FOLDER_COMMAND = "explorer shell:appsFolder\\"
+
+    def __init__(self):
+        import pygetwindow as gw
+        self._gw = gw
+        self._app_opener = None
+        self._catalogue = None
+
+    def get_all_windows(self):
+        return self._gw.getAllWindows()
+
+    def get_windows_with_title(self, title):
+        return self._gw.getWindowsWithTitle(title)
+
+    def window_for_handle(self, hwnd):
+        return self._gw.Win32Window(hwnd)
+
+    def get_window_rect(self, hwnd):
+        """Read (left, top, width, height) straight from a window handle"""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        rect = wintypes.RECT()
+        if not user32.IsWindow(hwnd) or not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            raise ctypes.WinError()
+        return rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top
+
+    def window_process_name(self, hwnd):
+        """Executable name (e.g. ``Discord.exe``) of the process owning a window"""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        pid = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        process = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not process:
+            raise ctypes.WinError()
+        try:
+            size = wintypes.DWORD(MAX_PATH_LENGTH)
+            buffer = ctypes.create_unicode_buffer(MAX_PATH_LENGTH)
+            if not kernel32.QueryFullProcessImageNameW(process, 0, buffer, ctypes.byref(size)):
+                raise ctypes.WinError()
+        finally:
+            kernel32.CloseHandle(process)
+        return os.path.basename(buffer.value)
+
+    def window_pid(self, hwnd):
+        """ID of the process that created a window"""
+        import ctypes
+        from ctypes import wintypes
+
+        pid = wintypes.DWORD()
+        if not ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid)):
+            raise ctypes.WinError()
+        return pid.value
+
+    def process_parents(self):
+        """Map every running process ID to its parent's, from one Toolhelp32 snapshot"""
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", wintypes.DWORD),
+                ("cntUsage", wintypes.DWORD),
+                ("th32ProcessID", wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", wintypes.DWORD),
+                ("cntThreads", wintypes.DWORD),
+                ("th32ParentProcessID", wintypes.DWORD),
+                ("pcPriClassBase", wintypes.LONG),
+                ("dwFlags", wintypes.DWORD),
+                ("szExeFile", wintypes.WCHAR * 260),
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if snapshot in (None, wintypes.HANDLE(-1).value):
+            raise ctypes.WinError()
+        parents = {}
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            more = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+            while more:
+                parents[entry.th32ProcessID] = entry.th32ParentProcessID
+                more = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(snapshot)
+        return parents
+
+    def ui_ready(self):
+        """Whether the shell is far enough along at login to own a desktop window"""
+        import ctypes
+
+        return bool(ctypes.windll.user32.GetDesktopWindow())
+
+    def display_signature(self):
+        """Monitor count and virtual-screen bounds; changes when displays are (un)plugged or resized"""
+        import ctypes
+
+        metrics = ctypes.windll.user32.GetSystemMetrics
+        return tuple(metrics(index) for index in (SM_CMONITORS, SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN,
+                                                  SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN))
+
+    def window_class_name(self, hwnd):
+        import ctypes
+
+        buffer = ctypes.create_unicode_buffer(256)
+        if not ctypes.windll.user32.GetClassNameW(hwnd, buffer, 256):
+            raise ctypes.WinError()
+        return buffer.value
+
+    def apply_placements(self, placements):
+        """Move and resize windows in one DeferWindowPos transaction.
+
+        ``placements`` is a list of ``(window, x, y, width, height)``. Returns
+        one entry per placement: None on success, otherwise the error. If the
+        transaction cannot be completed (e.g. a window vanished mid-batch) each
+        window falls back to its own SetWindowPos call.
+        """
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        user32.BeginDeferWindowPos.restype = wintypes.HANDLE
+        user32.DeferWindowPos.restype = wintypes.HANDLE
+        user32.DeferWindowPos.argtypes = [wintypes.HANDLE, wintypes.HWND, wintypes.HWND,
+                                          ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                          wintypes.UINT]
+        user32.EndDeferWindowPos.argtypes = [wintypes.HANDLE]
+        user32.SetWindowPos.argtypes = [wintypes.HWND, wintypes.HWND,
+                                        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                        wintypes.UINT]
+
+        hdwp = user32.BeginDeferWindowPos(len(placements))
+        for window, x, y, width, height in placements:
+            if not hdwp:
+                break
+            hdwp = user32.DeferWindowPos(hdwp, window._hWnd, None, x, y, width, height, PLACEMENT_FLAGS)
+        if hdwp and user32.EndDeferWindowPos(hdwp):
+            return [None] * len(placements)
+
+        errors = []
+        for window, x, y, width, height in placements:
+            if user32.SetWindowPos(window._hWnd, None, x, y, width, height, PLACEMENT_FLAGS):
+                errors.append(None)
+            else:
+                errors.append(ctypes.WinError())
+        return errors
+
+    def open_app(self, app_name):
+        """Launch an app through AppOpener's closest-match lookup"""
+        if self._app_opener is None:
+            import AppOpener
+            self._app_opener = AppOpener
+        self._app_opener.open(app_name, match_closest=True)
+
+    def _app_catalogue(self):
+        """AppOpener's name -> AppID catalogue, read without importing AppOpener"""
+        if self._catalogue is None:
+            import importlib.util
+
+            spec = importlib.util.find_spec("AppOpener")
+            path = None
+            if spec and spec.origin:
+                path = os.path.join(os.path.dirname(spec.origin), "Data", "data.json")
+            if not path or not os.path.exists(path):
+                raise LookupError("AppOpener app catalogue not found")
+            with open(path, 'r') as f:
+                self._catalogue = json.load(f)
+        return self._catalogue
+
+    def resolve_app(self, query):
+        """Resolve a name the way AppOpener.open(match_closest=True) does.
+
+        Returns the shell command that launches the matched app, or None when
+        nothing in the catalogue is close enough. Raises LookupError when
+        AppOpener's catalogue is not available.
+        """
+        catalogue = self._app_catalogue()
+        name = re.sub(r'[^a-zA-Z-^0-9?,>&]', " ", query.lower()).strip()
+        app_id = catalogue.get(name)
+        if app_id is None:
+            import difflib
+
+            matches = difflib.get_close_matches(name, catalogue.keys(), n=1, cutoff=0.6)
+            if not matches:
+                return None
+            app_id = catalogue[matches[0]]
+        return self.APPS_FOLDER_COMMAND + app_id
+
+    def app_command_exists(self, command):
+        """Whether a cached launch command still points at something installed"""
+        if not command.startswith(self.APPS_FOLDER_COMMAND):
+            return True
+        app_id = command[len(self.APPS_FOLDER_COMMAND):]
+        if re.match(r'^[A-Za-z]:\\', app_id) and not os.path.exists(app_id):
+            return False
+        try:
+            return app_id in self._app_catalogue().values()
+        except LookupError:
+            return True
+
+    def run_command(self, command):
+        """Run a shell command, e.g. 'start spotify'"""
+        os.system(command)
+
+    def spawn(self, command_line):
+        """Start a process from a command line without waiting for it"""
+        import shlex
+        import subprocess
+
+        return subprocess.Popen(shlex.split(command_line, posix=False))
+
@@ -0,0 +1,79 @@
+APP_MAPPINGS = {
+    "WhatsApp": "whatsapp",
+    "Amis": "discord",
+    "Discord": "discord",
+    "Google Chrome": "chrome",
+    "Mozilla Firefox": "firefox",
+    "Microsoft Edge": "edge",
+    "Visual Studio Code": "code",
+    "SPOTIFY PREMIUM": "spotify",
+    "Spotify": "spotify",
+    "Steam": "steam",
+    "Explorateur de fichiers": "explorer",
+    "File Explorer": "explorer",
+    "Messenger": "messenger",
+    "SteelSeries GG": "steelseries-gg",
+    "Mobile connecté": "Mobile connect",
+    "Your Phone": "phone",
+    "Phone Link": "phone",
+}
+
+
+def clean_app_name(title):
+    """App name to launch a window's app by, from the first part of its title"""
+    app_name = title.split(" - ")[0].strip()
+    return APP_MAPPINGS.get(app_name, app_name.lower())
+
+
+def window_info(window, rect=None):
+    """Config for a window; ``rect`` is (left, top, width, height) if already read"""
+    left, top, width, height = rect or (window.left, window.top, window.width, window.height)
+    return {
+        "x": left,
+        "y": top,
+        "width": width,
+        "height": height,
+        "app_name": clean_app_name(window.title),
+        "original_title": window.title,
+        "position_only": False,
+        "open_method": ""
+    }
+
+
+def capture_windows(backend, selected, logger=None, windows=None):
+    """Read the rectangles of the selected ``(title, handle)`` pairs, grouped by title.
+
+    One desktop enumeration (or ``windows``, if the caller already has one)
+    tells which windows still exist; each rectangle is then read once
+    straight from its handle.
+    """
+    live = {window._hWnd: window for window in (windows if windows is not None else backend.get_all_windows())}
+    captured = {}
+    for window_title, hwnd in selected:
+        window = live.get(hwnd)
+        try:
+            if window is None:
+                raise LookupError(f"No window with handle {hwnd}")
+            rect = backend.get_window_rect(hwnd)
+        except Exception:
+            if logger:
+                logger.warning(f"Could not find window: {window_title}")
+            continue
+        captured.setdefault(window_title, []).append((window, rect))
+    return captured
+
+
+def layout_config(captured, existing=None, info=window_info):
+    """Config for one title's captured ``(window, rect)`` pairs.
+
+    Several windows sharing a title get a slot each. ``position_only`` and
+    ``open_method`` are kept from the ``existing`` config.
+    """
+    window, rect = captured[0]
+    config = info(window, rect)
+    if len(captured) > 1:
+        config["slots"] = [dict(zip(("x", "y", "width", "height"), rect)) for _, rect in captured]
+    for key in ("position_only", "open_method"):
+        if existing and key in existing:
+            config[key] = existing[key]
+    return config
@@ -0,0 +1,161 @@
+import json
+import threading
+import time
+
+from organiser.json_file import write_atomic
+
+RECT_KEYS = ("x", "y", "width", "height")
+
+
+class ConfigError(ValueError):
+    """window_config.json could not be parsed or is not a mapping of configs"""
+
+
+ORDER_KEYS = ("priority", "weight")  # Optional, but must be numbers when present: launches are sorted by them
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _has_rect(entry):
+    return all(_is_number(entry.get(key)) for key in RECT_KEYS)
+
+
+def invalid_reason(config):
+    """Why a single window config can't be used, or None when it can"""
+    if not isinstance(config, dict):
+        return "not an object"
+    bad = [key for key in ORDER_KEYS if key in config and not _is_number(config[key])]
+    if bad:
+        return f"{' and '.join(bad)} must be a number"
+    slots = config.get("slots")
+    if slots:
+        if not isinstance(slots, list) or not all(isinstance(slot, dict) and _has_rect(slot) for slot in slots):
+            return "every slot needs numeric x, y, width and height"
+        return None
+    if not _has_rect(config):
+        return "needs numeric x, y, width and height"
+    return None
+
+
+def usable_configs(configs, logger=None):
+    """The configs that can be applied; the others are left out with a warning"""
+    usable = {}
+    for title, config in configs.items():
+        reason = invalid_reason(config)
+        if reason:
+            if logger:
+                logger.warning(f"Ignoring config for {title}: {reason}")
+            continue
+        usable[title] = config
+    return usable
+
+
+class ConfigStore:
+    """window_config.json, read with one validated load and written atomically.
+
+    Writes go to a temporary file in the same directory which then replaces
+    the config with ``os.replace``, so a reader (the organiser at login) sees
+    either the old file or the new one, never half of one. ``save_later``
+    serialises the configs right away but leaves the disk write to a
+    background thread, which waits until ``delay`` seconds pass without
+    another save so that a burst of edits costs a single write.
+    """
+
+    def __init__(self, path, logger=None, delay=0.5):
+        self.path = path
+        self.logger = logger
+        self.delay = delay
+        self.writes = 0
+        self._pending = None  # (generation, text) waiting for the writer
+        self._generation = 0
+        self._written = 0
+        self._saved_at = 0.0
+        self._changed = threading.Condition()
+        self._writer = None
+        self._write_lock = threading.Lock()
+
+    def load(self):
+        """The configs in the file ({} when it doesn't exist); invalid entries are dropped with a warning.
+
+        Raises ConfigError when the file isn't JSON or isn't an object.
+        """
+        return usable_configs(self.load_raw(), self.logger)
+
+    def load_raw(self):
+        """Every entry in the file, usable or not, for editors that save the mapping back.
+
+        Writing back what ``load`` returns would silently delete a hand-edited
+        config with a typo in it. Raises ConfigError like ``load``.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        except FileNotFoundError:
+            return {}
+        if not content:
+            return {}
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ConfigError(f"{self.path} is not valid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise ConfigError(f"{self.path} must contain an object of window configs")
+        return data
+
+    def save(self, configs):
+        """Write ``configs`` now, replacing any write still waiting; returns whether it was written"""
+        text = json.dumps(configs, indent=4)
+        with self._changed:
+            self._generation += 1
+            generation = self._generation
+            self._pending = None
+        return self._write(generation, text)
+
+    def save_later(self, configs):
+        """Schedule a write of ``configs`` (as they are now) once edits stop for ``delay`` seconds"""
+        text = json.dumps(configs, indent=4)
+        with self._changed:
+            self._generation += 1
+            self._pending = (self._generation, text)
+            self._saved_at = time.monotonic()
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="config-writer", daemon=True)
+                self._writer.start()
+            self._changed.notify_all()
+
+    def flush(self):
+        """Write a pending save right away (e.g. before exiting)"""
+        with self._changed:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self._write(*pending)
+        with self._write_lock:
+            pass  # Let a write the background thread already started finish
+
+    def _write_loop(self):
+        while True:
+            with self._changed:
+                while self._pending is None:
+                    self._changed.wait()
+                quiet_for = time.monotonic() - self._saved_at
+                if quiet_for < self.delay:
+                    self._changed.wait(self.delay - quiet_for)
+                    continue
+                pending, self._pending = self._pending, None
+            self._write(*pending)
+
+    def _write(self, generation, text):
+        with self._write_lock:
+            if generation <= self._written:
+                return True  # A newer save already reached the disk
+            try:
+                write_atomic(self.path, text)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Failed to save config to {self.path}: {e}")
+                return False
+            self.writes += 1
+            self._written = generation
+        return True
@@ -0,0 +1,168 @@
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+
+from organiser.json_file import write_json
+
+
+STATE_FILE = "organizer_daemon.json"
+HOST = "127.0.0.1"
+
+
+class DaemonNotRunning(Exception):
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(65536)
+        try:
+            request = json.loads(line.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+            response = self.server.daemon.handle(request)
+        except ValueError as e:
+            response = {"ok": False, "error": f"Bad request: {e}"}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+
+class OrganiserDaemon:
+    """Keeps the organiser resident and applies the layout on request.
+
+    Commands arrive as one JSON line per connection on a localhost socket.
+    The port and a random token are written to ``state_path``; requests
+    without the token are refused, so only processes that can read the
+    organiser's directory can drive it. ``apply(reason)`` does the work and
+    returns a JSON-serialisable summary; runs never overlap.
+
+    With ``display_signature`` (a callable returning anything comparable,
+    e.g. monitor count and virtual-screen bounds) the layout is also
+    re-applied once the display configuration changes and stays put for
+    one more poll.
+    """
+
+    def __init__(self, apply, logger, state_path=STATE_FILE, port=0, display_signature=None,
+                 display_poll=2.0):
+        self.apply = apply
+        self.logger = logger
+        self.state_path = state_path
+        self.port = port
+        self.display_signature = display_signature
+        self.display_poll = display_poll
+        self.token = secrets.token_hex(16)
+        self.runs = 0
+        self.last_run = None
+        self.started_at = time.time()
+        self.server = None
+        self._apply_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self):
+        self.server = _Server((HOST, self.port), _Handler)
+        self.server.daemon = self
+        self.port = self.server.server_address[1]
+        # Atomic, so a client never reads a half-written token
+        write_json(self.state_path, {"port": self.port, "token": self.token, "pid": os.getpid()})
+        if self.display_signature:
+            threading.Thread(target=self._watch_display, name="display-watch", daemon=True).start()
+        self.logger.info(f"Daemon listening on {HOST}:{self.port}")
+        return self
+
+    def serve_forever(self):
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self._remove_state()
+
+    def stop(self):
+        self._stopped.set()
+        # shutdown() blocks until serve_forever returns, so never call it on the serving thread
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def _remove_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                if json.load(f).get("token") != self.token:
+                    return  # Another daemon has taken over the state file
+            os.remove(self.state_path)
+        except (OSError, ValueError):
+            pass
+
+    def handle(self, request):
+        if not secrets.compare_digest(str(request.get("token", "")), self.token):
+            return {"ok": False, "error": "Invalid token"}
+        command = request.get("command")
+        if command == "apply":
+            return self.run_apply(request.get("reason", "client"))
+        if command == "status":
+            return {"ok": True, "pid": os.getpid(), "uptime": round(time.time() - self.started_at, 1),
+                    "runs": self.runs, "busy": self._apply_lock.locked(), "last_run": self.last_run}
+        if command == "stop":
+            self.logger.info("Daemon stop requested")
+            self.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    def run_apply(self, reason):
+        with self._apply_lock:
+            self.logger.info(f"Applying layout ({reason})")
+            start = time.monotonic()
+            try:
+                summary = self.apply(reason)
+            except Exception as e:
+                self.logger.error(f"Layout apply failed: {e}")
+                return {"ok": False, "error": str(e)}
+            self.runs += 1
+            self.last_run = dict(summary, reason=reason, at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                                 elapsed=round(time.monotonic() - start, 3))
+            return {"ok": True, "run": self.last_run}
+
+    def _watch_display(self):
+        try:
+            current = self.display_signature()
+        except Exception as e:
+            self.logger.warning(f"Display change trigger disabled: {e}")
+            return
+        while not self._stopped.wait(self.display_poll):
+            try:
+                signature = self.display_signature()
+            except Exception as e:
+                self.logger.warning(f"Could not read display configuration: {e}")
+                continue
+            if signature == current:
+                continue
+            # Docking and resolution switches arrive in steps; wait until it settles
+            if self._stopped.wait(self.display_poll) or self.display_signature() != signature:
+                continue
+            self.logger.info(f"Display configuration changed: {current} -> {signature}")
+            current = signature
+            self.run_apply("display change")
+
+
+def send_command(command, state_path=STATE_FILE, timeout=120, **fields):
+    """Send one command to a running daemon and return its JSON response"""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        raise DaemonNotRunning(f"No daemon state in {state_path}")
+    request = dict(fields, command=command, token=state["token"])
+    try:
+        with socket.create_connection((HOST, state["port"]), timeout=timeout) as sock:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except ConnectionRefusedError:
+        raise DaemonNotRunning(f"Nothing listening on port {state['port']}")
+    if not line:
+        raise DaemonNotRunning("Daemon closed the connection")
+    return json.loads(line.decode("utf-8"))
@@ -0,0 +1,427 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from organiser.assignment import assign_slots
+from organiser.launch_cache import AppLauncher
+from organiser.launch_stats import WaitSchedule
+from organiser.placement import PlacementBatcher
+from organiser.planner import PLACED, plan_layout
+from organiser.process_index import ProcessWindowIndex
+from organiser.scheduler import LaunchScheduler, default_load_signal
+from organiser.snapshot import DesktopIndex
+from organiser.title_matcher import TitleMatcher, WindowMatch
+from organiser.tracing import Tracer
+from organiser.watcher import WindowWatcher
+
+
+# ``details`` holds what the run learned about the app: planned action, launch
+# method, seconds until its window appeared and placement retries
+AppResult = namedtuple("AppResult", ["title", "success", "elapsed", "details"], defaults=(None,))
+
+
+class OrganiserEngine:
+    """Launches and positions configured windows, several apps at a time"""
+
+    DEFAULT_MAX_WORKERS = 8
+    POSITION_ONLY_WAIT = 30  # Seconds to wait for a position_only window without history
+    LAUNCH_WAIT = 10  # Seconds to wait for a launched window without history
+    POLL_DELAY = 1  # Poll interval for apps without launch history
+    BASE_TICK = 0.1  # Granularity of the shared desktop snapshot
+    SETTLE_DELAY = 0.2  # Paid once per placement batch
+    COALESCE_DELAY = 0.05  # How long a batch waits for other ready windows
+    TOLERANCE = 2
+    MAX_PLACEMENT_ROUNDS = 3  # Apply + verify rounds for windows that snap back
+    LOAD_THRESHOLD = 0.85  # Heavy apps (weight > 1) wait while system pressure is above this
+
+    def __init__(self, backend, logger, max_workers=None, event_source=None, stats=None, tracer=None,
+                 launch_cache=None, progress=None, scheduler=None):
+        self.backend = backend
+        self.logger = logger
+        self.max_workers = max(1, max_workers or self.DEFAULT_MAX_WORKERS)
+        self.event_source = event_source
+        self.stats = stats
+        self.tracer = tracer or Tracer()
+        self.launch_cache = launch_cache
+        self.launcher = AppLauncher(backend, launch_cache, logger, self.tracer)
+        self.progress = progress
+        self.scheduler = scheduler or LaunchScheduler(default_load_signal(), self.LOAD_THRESHOLD, logger=logger)
+        self.cancelled = threading.Event()
+        self.index = DesktopIndex(backend, self.BASE_TICK)
+        self.placer = self._make_placer()
+        self.matcher = TitleMatcher({}, backend, logger)
+        self.processes = ProcessWindowIndex(backend, logger)
+        self.pending = frozenset()
+        self.bound = {}  # Handle -> config that took the window, for process binding
+        self.details = {}
+        self.waits = 0
+        self._pending_lock = threading.Lock()
+        self.watcher = None
+
+    def run(self, window_configs):
+        """Process every config concurrently and return results in config order"""
+        items = list(window_configs.items())
+        if not items:
+            return []
+        workers = min(self.max_workers, len(items))
+        self.logger.info(f"Organizing {len(items)} windows with {workers} workers")
+        # Fresh index per run so its counters describe this run only
+        self.index = DesktopIndex(self.backend, self.BASE_TICK)
+        self.placer = self._make_placer()
+        # Rules are compiled once per run; configs stay pending until processed
+        self.matcher = TitleMatcher(window_configs, self.backend, self.logger)
+        self.pending = frozenset(window_configs)
+        self.bound = {}
+        self.details = {}
+        self.waits = 0
+        self.processes = ProcessWindowIndex(self.backend, self.logger)
+        self.watcher = self._start_watcher()
+        started_at = time.monotonic()
+        # Windows already where they belong are done without a worker, batch or settle.
+        # They stay pending so no other config claims them during the run.
+        with self.tracer.span("plan", apps=len(items)):
+            plan = self.plan(window_configs, self.matcher)
+        for entry in plan:
+            self.note(entry.title, action=entry.action)
+        placed = set(entry.title for entry in plan if entry.action == PLACED)
+        if placed:
+            self.logger.info(f"Already in place: {len(placed)}/{len(items)} windows")
+        # Higher-priority apps reach a worker first; ties keep config order
+        by_priority = sorted((item for item in items if item[0] not in placed), key=lambda item: -item[1].get("priority", 0))
+        try:
+            with self.tracer.span("organise", apps=len(items), workers=workers), \
+                    ThreadPoolExecutor(max_workers=workers, thread_name_prefix="organiser") as pool:
+                futures = {title: pool.submit(self.process_app, title, config) for title, config in by_priority}
+                for title in placed:
+                    self.report(title, "done")
+                results = [futures[title].result() if title in futures
+                           else AppResult(title, True, 0.0, self.details.get(title, {}))
+                           for title, _ in items]
+        finally:
+            if self.watcher:
+                self.watcher.stop()
+            if self.stats:
+                self.stats.save()
+            if self.launch_cache:
+                self.launch_cache.save()
+        stats = self.index.stats()
+        events = self.watcher.events if self.watcher else 0
+        self.logger.info(f"Desktop enumerations: {stats['enumerations']} over {stats['ticks']} ticks ({stats['lookups']} lookups, {events} window events)")
+        self.logger.info(f"Placement batches: {self.placer.batches} ({self.placer.retries} window retries)")
+        if self.scheduler.deferrals:
+            self.logger.info(f"Launches held back by the scheduler: {self.scheduler.deferrals}")
+        if self.placer.first_applied_at is not None:
+            self.logger.info(f"First window positioned {self.placer.first_applied_at - started_at:.2f}s after the run started")
+        return results
+
+    def plan(self, window_configs, matcher=None):
+        """What a run would do with each config, from the current desktop snapshot (see organiser.planner)"""
+        matcher = matcher or TitleMatcher(window_configs, self.backend, self.logger)
+        self.index.lookups += 1
+        return plan_layout(window_configs, self.index.snapshot(), matcher, self.backend, self.TOLERANCE)
+
+    def set_tracer(self, tracer):
+        """Record later runs into a new tracer (a resident organiser traces each run separately)"""
+        self.tracer = tracer
+        self.launcher.tracer = tracer
+
+    def cancel(self):
+        """Stop waiting for windows; apps not yet started are skipped"""
+        self.cancelled.set()
+        if self.watcher:
+            self.watcher.wake()
+
+    def note(self, title, **values):
+        """Add to what this run records about an app (returned in its AppResult.details)"""
+        self.details.setdefault(title, {}).update(values)
+
+    def report(self, title, state):
+        """Tell the progress callback (if any) what an app is doing"""
+        if self.progress:
+            try:
+                self.progress(title, state)
+            except Exception as e:
+                self.logger.warning(f"Progress callback failed: {e}")
+
+    def _make_placer(self):
+        return PlacementBatcher(self.backend, self.logger, self.tracer,
+                                settle_delay=self.SETTLE_DELAY, coalesce_delay=self.COALESCE_DELAY,
+                                tolerance=self.TOLERANCE, max_rounds=self.MAX_PLACEMENT_ROUNDS)
+
+    def _start_watcher(self):
+        if not self.event_source:
+            return None
+        try:
+            return WindowWatcher(self.index, self.event_source).start()
+        except Exception as e:
+            self.logger.warning(f"Window event hooks unavailable, polling only: {e}")
+            return None
+
+    def process_app(self, title, config):
+        """Launch (if needed), wait for and position one configured window"""
+        start = time.monotonic()
+        if self.cancelled.is_set():
+            self.report(title, "cancelled")
+            return AppResult(title, False, 0.0, self.details.get(title, {}))
+        with self.tracer.span(title, cat="app") as span_args:
+            try:
+                success = self._process_app(title, config)
+            except Exception as e:
+                self.logger.error(f"Error processing window {title}: {e}")
+                success = False
+            span_args["success"] = success
+        with self._pending_lock:
+            self.pending = self.pending - {title}
+        if success:
+            self.report(title, "done")
+        else:
+            self.report(title, "cancelled" if self.cancelled.is_set() else "failed")
+        self.note(title, retries=self.placer.retries_for(title))
+        return AppResult(title, success, time.monotonic() - start, self.details[title])
+
+    def _process_app(self, title, config):
+        self.logger.info(f"Processing: {title}")
+        self.report(title, "checking")
+        match = self.find_window(title)
+        window = match.window if match else None
+        if match:
+            self.logger.info(f"Found open window for {title}: {window.title} (matched by {match.rule})")
+        position_only = config.get("position_only", False)
+
+        if position_only:
+            if not window:
+                self.logger.info(f"position_only set for {title}: will not launch, just wait for window")
+                window = self.wait_for_window(title, self.POSITION_ONLY_WAIT)
+        elif not window:
+            window = self.launch_when_admitted(title, config)
+
+        if not window:
+            self.logger.warning(f"Could not find or position window: {title}")
+            return False
+        with self._pending_lock:
+            self.bound[window._hWnd] = title
+        self.report(title, "positioning")
+        if config.get("slots"):
+            return self.position_slots(title, config)
+        return self.position_window(window, config, title)
+
+    def launch_when_admitted(self, title, config):
+        """Launch an app once the scheduler admits it, and wait for its window"""
+        priority = config.get("priority", 0)
+        weight = config.get("weight", 1)
+        self.report(title, "queued")
+        queued_at = time.monotonic()
+        with self.scheduler.slot(priority, weight, self.cancelled) as admitted:
+            if not admitted:
+                return None
+            held_back = time.monotonic() - queued_at
+            if held_back >= self.BASE_TICK:
+                self.logger.info(f"Launch of {title} held back {held_back:.2f}s (priority {priority}, weight {weight})")
+                self.tracer.instant("launch admitted", cat="launch", title=title, held_back=round(held_back, 3))
+            return self._launch_for_config(title, config)
+
+    def _launch_for_config(self, title, config):
+        open_method = config.get("open_method", "")
+        opening_method = config.get("opening_method", "")
+        if opening_method:
+            return self.launch_and_wait_for_window(
+                title, config["app_name"], config.get("original_title"),
+                opening_method=opening_method
+            )
+        if open_method in ("appopener", "system") or open_method.startswith("custom:"):
+            self.note(title, method=open_method.split(":", 1)[0])
+            launched_at = time.monotonic()
+            self.report(title, "launching")
+            try:
+                with self.tracer.span("launch attempt 1", cat="launch", title=title, method=open_method):
+                    if open_method == "appopener":
+                        self.backend.open_app(config["app_name"])
+                    elif open_method == "system":
+                        self.backend.run_command(f"start {config['app_name']}")
+                    else:
+                        self.backend.run_command(open_method[len("custom:"):])
+            except Exception as e:
+                self.logger.warning(f"{open_method} launch failed for {title}: {e}")
+            return self.wait_for_window(title, self.LAUNCH_WAIT, launched_at)
+        if open_method:
+            self.logger.warning(f"Unknown open_method '{open_method}' for {title}, falling back to default.")
+        return self.launch_and_wait_for_window(title, config["app_name"], config.get("original_title"))
+
+    def wait_schedule(self, title, default_timeout):
+        """Wait schedule for an app, learned from its launch history when available"""
+        if self.stats:
+            return self.stats.schedule(title, default_timeout, self.POLL_DELAY)
+        return WaitSchedule(self.POLL_DELAY, default_timeout, default_timeout)
+
+    def find_window(self, title):
+        """The window currently assigned to a config by its match rules, as a WindowMatch"""
+        self.index.lookups += 1
+        return self.matcher.assign(self.index.snapshot(), self.pending).get(title)
+
+    def wait_for_window(self, app_key, default_timeout, started_at=None, pid=None):
+        """Wait until a window matching the config's rules exists.
+
+        With ``pid`` (a process we launched), the first window owned by that
+        process or one of its descendants is bound right away, whatever its
+        title; the config's rules still apply for windows the app hands off
+        to an already-running instance.
+        Window events wake the waiter immediately; without them (or when an
+        event is missed) the shared snapshot is re-checked on the app's poll
+        schedule. The appearance time is recorded for the next run's schedule.
+        """
+        self.report(app_key, "waiting")
+        with self.tracer.span("wait for window", cat="wait", title=app_key) as span_args:
+            match = self._wait_for_window(app_key, default_timeout, started_at, pid)
+            span_args["found"] = match is not None
+            if match:
+                span_args["rule"] = str(match.rule)
+        return match.window if match else None
+
+    def _wait_for_window(self, app_key, default_timeout, started_at, pid=None):
+        start = started_at or time.monotonic()
+        schedule = self.wait_schedule(app_key, default_timeout)
+        deadline = start + schedule.timeout
+        attempt = 0
+        logged_titles = False
+        while True:
+            generation = self.watcher.generation if self.watcher else 0
+            try:
+                snapshot = self.index.snapshot()
+                self.index.lookups += 1
+                match = None
+                if pid:
+                    match = self.process_match(snapshot, app_key, pid)
+                if not match:
+                    match = self.matcher.assign(snapshot, self.pending).get(app_key)
+                if match:
+                    elapsed = time.monotonic() - start
+                    self.logger.info(f"Window appeared after {elapsed:.2f}s with title: {snapshot.title_of(match.window)} (matched by {match.rule})")
+                    self.tracer.instant("window appeared", cat="wait", title=app_key, after=round(elapsed, 3))
+                    if self.stats:
+                        self.stats.record(app_key, elapsed)
+                    self.note(app_key, appeared_after=round(elapsed, 3))
+                    return match
+                if not logged_titles:
+                    self.logger.debug(f"Available windows while waiting: {snapshot.titles()}")
+                    logged_titles = True
+            except Exception as e:
+                self.logger.warning(f"Error enumerating windows: {e}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.cancelled.is_set():
+                self.logger.info(f"Stopped waiting for {app_key}: cancelled")
+                return None
+            interval = schedule.interval_at(time.monotonic() - start)
+            timeout = min(remaining, self.index.time_to_next_tick(interval))
+            self.waits += 1
+            if self.watcher:
+                if self.watcher.wait_for_change(generation, timeout):
+                    continue
+            else:
+                self.cancelled.wait(timeout)
+            attempt += 1
+            self.logger.debug(f"Waiting for {app_key}... (poll {attempt}, {time.monotonic() - start:.1f}/{schedule.timeout:.1f}s)")
+        if self.cancelled.is_set():
+            self.logger.info(f"Stopped waiting for {app_key}: cancelled")
+            return None  # Not a timeout: says nothing about how long the app takes
+        self.logger.warning(f"Window {app_key} did not appear after {schedule.timeout:.1f}s")
+        if self.stats:
+            self.stats.record_timeout(app_key)
+        return None
+
+    def process_match(self, snapshot, app_key, pid):
+        """A window of the launched process family for ``app_key``, as a WindowMatch.
+
+        Launches can share a process (PWAs handed off to one browser), so
+        windows another config was assigned or has already taken are skipped,
+        and a window this config's own rules match beats the topmost one.
+        """
+        family = self.processes.windows_for(snapshot, pid)
+        if not family:
+            return None
+        with self._pending_lock:
+            taken = set(handle for handle, title in self.bound.items() if title != app_key)
+        taken.update(match.window._hWnd for key, match in self.matcher.assign(snapshot, self.pending).items()
+                     if key != app_key)
+        free = [window for window in family if window._hWnd not in taken]
+        for window in free:
+            for key, priority, rule in self.matcher.candidates(window, snapshot.title_of(window)):
+                if key == app_key:
+                    return WindowMatch(window, f"process {pid} and {rule}")
+        return WindowMatch(free[0], f"process {pid}") if free else None
+
+    def launch_and_wait_for_window(self, title, app_name, original_title=None, timeout=None, opening_method=None):
+        """Try to launch an app and wait for its window to appear."""
+        timeout = timeout or self.LAUNCH_WAIT
+        launched_at = time.monotonic()
+
+        self.report(title, "launching")
+        pid = None
+        if opening_method:
+            self.logger.info(f"Launching {title} using custom opening_method: {opening_method}")
+            try:
+                with self.tracer.span("launch attempt 1", cat="launch", title=title, method="opening_method"):
+                    pid = getattr(self.backend.spawn(opening_method), "pid", None)
+            except Exception as e:
+                self.logger.error(f"Failed to launch {title} with subprocess: {e}")
+                return None
+            self.logger.info(f"Launched {title} as process {pid}")
+            self.note(title, method="opening_method")
+        else:
+            self.logger.info(f"Attempting to launch {app_name} (original title: {original_title})")
+            strategy = self.launcher.launch(app_name)
+            if not strategy:
+                self.logger.error(f"All launch attempts failed for {app_name}")
+                return None
+            self.note(title, method=strategy)
+
+        window = self.wait_for_window(title, timeout, launched_at, pid)
+        # A cancelled wait says nothing about whether the cached launch works
+        if window is None and not opening_method and not self.cancelled.is_set():
+            self.launcher.launch_failed(app_name)
+        return window
+
+    def position_window(self, window, config, title):
+        """Place a window as part of the current placement batch and verify it"""
+        try:
+            return self.placer.place(window, config, title)
+        except Exception as e:
+            self.logger.error(f"Failed to position {title}: {e}")
+            return False
+
+    def position_slots(self, title, config):
+        """Give each of a config's windows its own slot, moving them as little as possible in total.
+
+        Every window the config's rules match (and no other pending config
+        was assigned) is paired with a slot by minimum total movement and
+        resize distance; all of them are then placed in one batch. Windows
+        beyond the number of slots are left alone.
+        """
+        slots = config["slots"]
+        snapshot = self.index.refresh()  # Instances that opened with the first one must be seen too
+        windows = self.matcher.matching_windows(snapshot, title, self.pending)
+        rects = []
+        for window in windows:
+            try:
+                rects.append(self.backend.get_window_rect(window._hWnd))
+            except Exception as e:
+                self.logger.warning(f"Window disappeared before slot assignment: {window.title} ({e})")
+                rects.append(None)
+        live = [(window, rect) for window, rect in zip(windows, rects) if rect is not None]
+        assignment = assign_slots([rect for _, rect in live], slots)
+        self.logger.info(f"Assigning {len(live)} {title} windows to {len(slots)} slots")
+        if len(live) > len(slots):
+            self.logger.info(f"{len(live) - len(slots)} {title} windows have no slot and stay where they are")
+        elif len(live) < len(slots):
+            self.logger.info(f"{len(slots) - len(live)} {title} slots have no window")
+        placements = [(live[index][0], dict(config, **slots[slot]), f"{title} [slot {slot + 1}]")
+                      for index, slot in sorted(assignment.items(), key=lambda item: item[1])]
+        if not placements:
+            return False
+        try:
+            return all(self.placer.place_many(placements))
+        except Exception as e:
+            self.logger.error(f"Failed to position {title}: {e}")
+            return False
@@ -0,0 +1,42 @@
+import json
+import os
+
+
+def read_json(path):
+    """Parsed contents of a JSON file, or None when it is missing or empty; raises on bad JSON"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return json.loads(content) if content else None
+
+
+def write_atomic(path, text):
+    """Replace ``path`` with ``text`` so readers see the old file or the new one, never half of one.
+
+    The text goes to a temporary file in the same directory, is flushed to
+    disk and then renamed over ``path`` with ``os.replace``. Raises OSError
+    on failure, leaving ``path`` untouched.
+    """
+    import tempfile  # Only needed once a run is over; keep it off the startup path
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path, data):
+    """Atomically write ``data`` as indented JSON"""
+    write_atomic(path, json.dumps(data, indent=4))
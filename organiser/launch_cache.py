@@ -0,0 +1,155 @@
+import threading
+
+from organiser.json_file import read_json, write_json
+
+
+class LaunchCache:
+    """Persistent record of which launch strategy worked for each app_name.
+
+    Entries look like ``{"strategy": "appopener-hyphen", "query":
+    "steelseries-gg", "command": "explorer shell:appsFolder\\..."}``. They
+    are dropped as soon as the resolved target disappears or a launch through
+    them fails to produce a window.
+    """
+
+    def __init__(self, path="launch_cache.json", logger=None):
+        self.path = path
+        self.logger = logger
+        self.entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            self.entries = read_json(self.path) or {}
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not load launch cache from {self.path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self.entries)
+            self._dirty = False
+        try:
+            write_json(self.path, data)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not save launch cache to {self.path}: {e}")
+
+    def get(self, app_name):
+        with self._lock:
+            return self.entries.get(app_name)
+
+    def remember(self, app_name, strategy, query, command):
+        entry = {"strategy": strategy, "query": query, "command": command}
+        with self._lock:
+            if self.entries.get(app_name) != entry:
+                self.entries[app_name] = entry
+                self._dirty = True
+
+    def invalidate(self, app_name, reason):
+        with self._lock:
+            if self.entries.pop(app_name, None) is None:
+                return
+            self._dirty = True
+        if self.logger:
+            self.logger.info(f"Dropped cached launch for {app_name}: {reason}")
+
+
+class AppLauncher:
+    """Launches an app by name, going straight to the cached command when there is one.
+
+    Cold launches try the same four strategies the organiser always used
+    (AppOpener name, hyphenated, without spaces, then ``start``), but resolve
+    AppOpener names against its catalogue first so a miss falls through to
+    the next strategy instead of silently doing nothing.
+    """
+
+    def __init__(self, backend, cache, logger, tracer=None):
+        self.backend = backend
+        self.cache = cache
+        self.logger = logger
+        self.tracer = tracer
+
+    def strategies(self, app_name):
+        return [
+            ("appopener", app_name),
+            ("appopener-hyphen", app_name.replace(" ", "-")),
+            ("appopener-nospace", app_name.replace(" ", "")),
+            ("system", app_name),
+        ]
+
+    def launch(self, app_name):
+        """Launch an app and return the strategy used, or None if every strategy failed"""
+        entry = self.cache.get(app_name) if self.cache else None
+        if entry:
+            if self._launch_cached(app_name, entry):
+                return entry["strategy"]
+
+        for i, (strategy, query) in enumerate(self.strategies(app_name)):
+            self.logger.info(f"Launch attempt {i+1} with method: {strategy}")
+            try:
+                if self.tracer:
+                    with self.tracer.span(f"launch attempt {i+1}", cat="launch", app=app_name, method=strategy):
+                        command = self._try_strategy(strategy, query)
+                else:
+                    command = self._try_strategy(strategy, query)
+            except Exception as e:
+                self.logger.warning(f"Launch attempt {i+1} failed: {e}")
+                continue
+            if command is False:
+                self.logger.info(f"Launch attempt {i+1}: no app matching '{query}'")
+                continue
+            if self.cache:
+                self.cache.remember(app_name, strategy, query, command)
+            return strategy
+        return None
+
+    def _try_strategy(self, strategy, query):
+        """Run one strategy; returns the resolved command, None if unresolvable but launched, False on a miss"""
+        if strategy == "system":
+            command = f"start {query}"
+            self.backend.run_command(command)
+            return command
+        try:
+            command = self.backend.resolve_app(query)
+        except LookupError:
+            # No catalogue to resolve against: let AppOpener do its own matching
+            self.backend.open_app(query)
+            return None
+        if not command:
+            return False
+        self.backend.run_command(command)
+        return command
+
+    def _launch_cached(self, app_name, entry):
+        command = entry.get("command")
+        if command and not self.backend.app_command_exists(command):
+            self.cache.invalidate(app_name, "launch target no longer exists")
+            return False
+        self.logger.info(f"Launching {app_name} with cached {entry['strategy']} strategy")
+        try:
+            if self.tracer:
+                with self.tracer.span("launch attempt 1", cat="launch", app=app_name, method=f"cached {entry['strategy']}"):
+                    self._run_entry(entry)
+            else:
+                self._run_entry(entry)
+            return True
+        except Exception as e:
+            self.cache.invalidate(app_name, f"cached launch failed: {e}")
+            return False
+
+    def _run_entry(self, entry):
+        if entry.get("command"):
+            self.backend.run_command(entry["command"])
+        else:
+            self.backend.open_app(entry["query"])
+
+    def launch_failed(self, app_name):
+        """Forget the cached strategy for an app whose window never appeared"""
+        if self.cache:
+            self.cache.invalidate(app_name, "window did not appear after launch")
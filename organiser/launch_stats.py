@@ -0,0 +1,118 @@
+import math
+import threading
+from collections import namedtuple
+
+from organiser.json_file import read_json, write_json
+
+
+class WaitSchedule(namedtuple("WaitSchedule", ["poll_interval", "backoff_after", "timeout"])):
+    """How often to re-check for a window, when to slow down and when to give up"""
+
+    MAX_INTERVAL = 2.0
+
+    def interval_at(self, elapsed):
+        if elapsed < self.backoff_after:
+            return self.poll_interval
+        # Double the interval for every further backoff_after spent waiting
+        spans = int((elapsed - self.backoff_after) / max(self.backoff_after, 0.1)) + 1
+        return min(self.MAX_INTERVAL, self.poll_interval * 2 ** spans)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LaunchStats:
+    """Persistent per-app history of how long windows took to appear.
+
+    Each app keeps its last MAX_SAMPLES appearance times; only windows that
+    actually appeared are sampled. Waits that timed out are counted
+    separately, as misses since the app's last appearance: while an app is
+    missing its learned deadline (e.g. it got slower after an update) the
+    schedule widens back to the default timeout and beyond, so the app gets
+    a chance to record a new sample instead of failing on every run.
+    """
+
+    MAX_SAMPLES = 20
+    MIN_SAMPLES = 3  # Below this we fall back to the fixed defaults
+    MIN_POLL = 0.1
+    MIN_TIMEOUT = 3.0
+    MAX_TIMEOUT_FACTOR = 2.0  # A learned timeout never exceeds this multiple of the default
+
+    def __init__(self, path="launch_stats.json", logger=None):
+        self.path = path
+        self.logger = logger
+        self.samples = {}
+        self.timeouts = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            data = read_json(self.path) or {}
+            if "samples" in data and isinstance(data["samples"], dict):
+                self.samples = data["samples"]
+                self.timeouts = data.get("timeouts", {})
+            else:
+                self.samples = data  # Files from before timeouts were counted
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not load launch stats from {self.path}: {e}")
+            self.samples = {}
+            self.timeouts = {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"samples": dict(self.samples), "timeouts": dict(self.timeouts)}
+            self._dirty = False
+        try:
+            write_json(self.path, data)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not save launch stats to {self.path}: {e}")
+
+    def record(self, app, seconds):
+        """Record how long an app's window took to appear"""
+        with self._lock:
+            history = self.samples.setdefault(app, [])
+            history.append(round(seconds, 3))
+            del history[:-self.MAX_SAMPLES]
+            self.timeouts.pop(app, None)
+            self._dirty = True
+
+    def record_timeout(self, app):
+        """Count a wait that gave up; it is not an appearance time, so it is not sampled"""
+        with self._lock:
+            self.timeouts[app] = self.timeouts.get(app, 0) + 1
+            self._dirty = True
+
+    def estimate(self, app):
+        """Return (p50, p95) appearance time for an app, or None without enough history"""
+        with self._lock:
+            history = list(self.samples.get(app, ()))
+        if len(history) < self.MIN_SAMPLES:
+            return None
+        return percentile(history, 50), percentile(history, 95)
+
+    def schedule(self, app, default_timeout, default_interval):
+        """Pick a wait schedule for an app from its history"""
+        estimate = self.estimate(app)
+        if estimate is None:
+            return WaitSchedule(default_interval, default_timeout, default_timeout)
+        p50, p95 = estimate
+        # Poll a few times before the typical appearance, back off once past p95
+        poll_interval = min(default_interval, max(self.MIN_POLL, p50 / 4))
+        timeout = max(self.MIN_TIMEOUT, p95 * 2 + 2)
+        with self._lock:
+            misses = self.timeouts.get(app, 0)
+        if misses:
+            # The history no longer describes the app: wait at least the default, doubling per further miss
+            timeout = max(timeout, default_timeout * 2 ** (misses - 1))
+        timeout = min(default_timeout * self.MAX_TIMEOUT_FACTOR, timeout)
+        return WaitSchedule(poll_interval, min(max(p95, poll_interval), timeout), timeout)
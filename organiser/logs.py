@@ -0,0 +1,109 @@
+import atexit
+import collections
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+
+LOG_FORMAT = "%(asctime)s %(levelname).1s [%(threadName)s] %(message)s"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` records of every level in memory until asked to write them out"""
+
+    def __init__(self, capacity=5000):
+        super().__init__(logging.DEBUG)
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        flushed = getattr(record, "flushed", None)
+        if flushed is not None:
+            flushed.set()  # Everything queued before the marker has been handled
+            return
+        self.records.append(record)
+
+    def dump(self, path, header):
+        """Write the buffered records to ``path``; returns how many were written"""
+        with self.lock:
+            records = list(self.records)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"{header}\n")
+            for record in records:
+                f.write(f"{self.format(record)}\n")
+        return len(records)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records with only their message merged; timestamps are formatted by the writer"""
+
+    def prepare(self, record):
+        # Arguments and tracebacks may not outlive the call, so they are resolved here
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class AsyncLog:
+    """Logging through a queue to a background writer thread.
+
+    Callers only pay for formatting their message and a queue put. The
+    writer appends INFO and above to ``log_file`` in a compact one-line
+    format, rotating it at ``max_bytes`` and keeping ``backup_count`` old
+    files, so earlier runs are not lost. Records of every level, DEBUG
+    included, also go to an in-memory ring buffer that ``dump_debug``
+    writes to ``debug_file`` when a run had failures.
+    """
+
+    def __init__(self, name, log_file, debug_file, max_bytes=1_000_000, backup_count=3, ring_capacity=5000):
+        self.debug_file = debug_file
+        formatter = logging.Formatter(LOG_FORMAT)
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                            encoding='utf-8', delay=True)
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(formatter)
+        self.ring = RingBufferHandler(ring_capacity)
+        self.ring.setFormatter(formatter)
+        self._queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(self._queue, file_handler, self.ring,
+                                                       respect_handler_level=True)
+        self.handler = _QueueHandler(self._queue)
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.handler)
+        self.logger.propagate = False
+        self.listener.start()
+        self._closed = False
+        atexit.register(self.close)
+
+    def flush(self, timeout=2):
+        """Wait until the writer has handled everything logged so far"""
+        if self._closed:
+            return True
+        marker = logging.LogRecord(self.logger.name, logging.DEBUG, __file__, 0, "flush", None, None)
+        marker.flushed = threading.Event()
+        self._queue.put(marker)
+        return marker.flushed.wait(timeout)
+
+    def dump_debug(self, reason):
+        """Write the ring buffer's recent detail to ``debug_file``, e.g. after a run with failures"""
+        self.flush()
+        try:
+            count = self.ring.dump(self.debug_file, f"=== {time.strftime('%Y-%m-%d %H:%M:%S')} {reason} ===")
+        except OSError as e:
+            self.logger.warning(f"Could not write debug log {self.debug_file}: {e}")
+            return
+        self.logger.info(f"Wrote {count} recent log records to {self.debug_file}")
+
+    def close(self):
+        """Drain the queue and stop the writer; safe to call more than once"""
+        if self._closed:
+            return
+        self._closed = True
+        self.listener.stop()
+        self.logger.removeHandler(self.handler)
+        for handler in self.listener.handlers:
+            handler.close()
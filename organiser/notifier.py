@@ -0,0 +1,109 @@
+import itertools
+import threading
+import time
+
+
+class Win10ToastBackend:
+    """Windows toasts through win10toast, imported on the first toast"""
+
+    def __init__(self, icon_path=None):
+        self.icon_path = icon_path
+        self._toaster = None
+
+    def show(self, title, message, duration):
+        if self._toaster is None:
+            from win10toast import ToastNotifier
+            self._toaster = ToastNotifier()
+        # Blocking is fine here: this only ever runs on the notifier thread
+        self._toaster.show_toast(title, message, icon_path=self.icon_path, duration=duration, threaded=False)
+
+
+class StubNotifierBackend:
+    """Records notifications instead of showing them; ``delay`` mimics a toast's display time"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.shown = []
+
+    def show(self, title, message, duration):
+        self.shown.append((title, message, duration))
+        if self.delay:
+            time.sleep(self.delay)
+
+
+class Notifier:
+    """Shows notifications from its own thread so callers never wait on a toast.
+
+    ``notify`` only queues the message. The notifier thread waits
+    ``coalesce_delay`` for more messages and shows everything queued by then
+    as one notification; a message queued with the ``key`` of one still
+    waiting replaces it, so per-app progress collapses into its latest
+    state. ``close`` flushes what is left but gives up at its deadline.
+    """
+
+    def __init__(self, backend, title, logger=None, tracer=None, coalesce_delay=0.5):
+        self.backend = backend
+        self.title = title
+        self.logger = logger
+        self.tracer = tracer
+        self.coalesce_delay = coalesce_delay
+        self.shown = 0
+        self._pending = {}
+        self._unkeyed = itertools.count()
+        self._closing = False
+        self._changed = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._thread.start()
+
+    def notify(self, message, duration=3, key=None):
+        with self._changed:
+            if self._closing:
+                return
+            if key is None:
+                key = ("message", next(self._unkeyed))
+            # Re-inserting moves a replaced message to the end, after what came before it
+            self._pending.pop(key, None)
+            self._pending[key] = (message, duration)
+            self._changed.notify()
+
+    def close(self, timeout=2.0):
+        """Stop accepting messages and wait up to ``timeout`` seconds for the rest to be shown"""
+        with self._changed:
+            self._closing = True
+            self._changed.notify()
+        self._thread.join(timeout)
+        if self._thread.is_alive() and self.logger:
+            self.logger.info(f"Notifications still pending after {timeout}s, not waiting for them")
+
+    def _take_batch(self):
+        with self._changed:
+            self._changed.wait_for(lambda: self._pending or self._closing)
+            if not self._pending:
+                return None
+            if not self._closing:
+                deadline = time.monotonic() + self.coalesce_delay
+                while not self._closing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+            batch, self._pending = list(self._pending.values()), {}
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            message = "\n".join(message for message, _ in batch)
+            duration = max(duration for _, duration in batch)
+            try:
+                if self.tracer:
+                    with self.tracer.span("toast", cat="notify", messages=len(batch)):
+                        self.backend.show(self.title, message, duration)
+                else:
+                    self.backend.show(self.title, message, duration)
+                self.shown += 1
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"Could not show notification: {e}")
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import Counter
+
+
+class PlacementRequest:
+    """One window waiting for its batch to be applied and verified"""
+
+    def __init__(self, window, config, title):
+        self.window = window
+        self.config = config
+        self.title = title
+        self.hwnd = None
+        self.initial_pos = None
+        self.final_pos = None
+        self.result = False
+        self.done = threading.Event()
+
+    @property
+    def target(self):
+        return (self.config["x"], self.config["y"], self.config["width"], self.config["height"])
+
+
+class PlacementBatcher:
+    """Applies the target rectangles of every ready window in one backend call.
+
+    The first thread to submit a window becomes the batch leader: it waits
+    ``coalesce_delay`` for other windows that are ready at about the same
+    time, applies the whole batch, sleeps ``settle_delay`` once and verifies
+    every window in it by reading its rectangle straight from its handle.
+    Windows still outside ``tolerance`` (apps that snap back after their
+    first paint) are re-applied together, with a doubling settle delay, for
+    up to ``max_rounds`` rounds. Other submitters just block until their
+    batch is done. Windows already within ``tolerance`` of their target are
+    left where they are.
+    """
+
+    def __init__(self, backend, logger, tracer, settle_delay=0.2, coalesce_delay=0.05,
+                 tolerance=2, max_rounds=3):
+        self.backend = backend
+        self.logger = logger
+        self.tracer = tracer
+        self.settle_delay = settle_delay
+        self.coalesce_delay = coalesce_delay
+        self.tolerance = tolerance
+        self.max_rounds = max_rounds
+        self.batches = 0
+        self.retries = 0
+        self.retried = Counter()  # Retries per window title
+        self.settles = 0
+        self.first_applied_at = None  # time.monotonic() of the first successful placement
+        self._pending = []
+        self._leader_waiting = False
+        self._lock = threading.Lock()
+
+    def place(self, window, config, title):
+        """Position a window as part of the next batch and return whether it verified"""
+        return self.place_many([(window, config, title)])[0]
+
+    def place_many(self, placements):
+        """Position several ``(window, config, title)`` in the same batch; one result per window"""
+        requests = [PlacementRequest(window, config, title) for window, config, title in placements]
+        with self._lock:
+            self._pending.extend(requests)
+            lead = not self._leader_waiting
+            self._leader_waiting = True
+        if lead:
+            self._flush()
+        for request in requests:
+            request.done.wait()
+        return [request.result for request in requests]
+
+    def retries_for(self, title):
+        """Retries spent on a config's windows, including each of its slots"""
+        return sum(count for placed, count in self.retried.items()
+                   if placed == title or placed.startswith(f"{title} [slot "))
+
+    def _flush(self):
+        time.sleep(self.coalesce_delay)
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._leader_waiting = False
+        try:
+            self._apply(batch)
+        except Exception as e:
+            self.logger.error(f"Placement batch failed: {e}")
+        finally:
+            for request in batch:
+                request.done.set()
+
+    def read_rect(self, request):
+        left, top, width, height = self.backend.get_window_rect(request.hwnd)
+        return {'left': left, 'top': top, 'width': width, 'height': height}
+
+    def mismatches(self, request, current_pos):
+        config = request.config
+        found = []
+        for key, pos_key, label in (("x", "left", "X"), ("y", "top", "Y"),
+                                    ("width", "width", "Width"), ("height", "height", "Height")):
+            if abs(current_pos[pos_key] - config[key]) > self.tolerance:
+                found.append(f"{label}: expected {config[key]}, got {current_pos[pos_key]}")
+        return found
+
+    def _apply(self, batch):
+        pending = []
+        for request in batch:
+            try:
+                request.hwnd = request.window._hWnd
+                request.initial_pos = self.read_rect(request)
+            except Exception as e:
+                self.logger.error(f"Failed to position {request.title}: {e}")
+                continue
+            self.logger.debug(f"{request.title}: at {request.initial_pos}, target {request.target}")
+            if self.mismatches(request, request.initial_pos):
+                pending.append(request)
+            else:
+                # Already in place: moving it again would only cost a settle
+                self.logger.info(f"Already in place: {request.title}")
+                request.final_pos = request.initial_pos
+                request.result = True
+        if not pending:
+            return
+        self.batches += 1
+
+        settle = self.settle_delay
+        for round_number in range(1, self.max_rounds + 1):
+            titles = [request.title for request in pending]
+            with self.tracer.span("resize/move batch", cat="position", titles=titles, round=round_number):
+                errors = self.backend.apply_placements([(request.window,) + request.target for request in pending])
+            placed = []
+            for request, error in zip(pending, errors):
+                if error:
+                    pos = request.initial_pos
+                    self.logger.error(f"Failed to position {request.title}: {error}")
+                    self.logger.error(f"Window state at failure - x={pos['left']}, y={pos['top']}, w={pos['width']}, h={pos['height']}")
+                else:
+                    if round_number == 1:
+                        self.logger.info(f"Positioned: {request.title}")
+                    if self.first_applied_at is None:
+                        self.first_applied_at = time.monotonic()
+                    placed.append(request)
+            if not placed:
+                return
+
+            # One settle delay for the whole batch instead of one per window
+            with self.tracer.span("settle", cat="position", windows=len(placed), round=round_number):
+                self.settles += 1
+                time.sleep(settle)
+            with self.tracer.span("verify batch", cat="position", windows=len(placed), round=round_number):
+                pending = []
+                for request in placed:
+                    if self._converged(request, round_number):
+                        request.done.set()  # Don't hold it back while others retry
+                    else:
+                        pending.append(request)
+            if not pending:
+                return
+            self.retries += len(pending)
+            self.retried.update(request.title for request in pending)
+            settle *= 2
+
+        for request in pending:
+            self._log_failure(request)
+
+    def _converged(self, request, round_number):
+        """Verify from the window handle; True once the window needs no further rounds"""
+        try:
+            request.final_pos = self.read_rect(request)
+        except Exception as e:
+            self.logger.warning(f"Window disappeared after positioning: {request.title} ({e})")
+            request.final_pos = None
+            request.result = False
+            return True  # Nothing left to converge
+        request.result = not self.mismatches(request, request.final_pos)
+        self.logger.debug(f"{request.title}: verified at {request.final_pos} (round {round_number})")
+        if not request.result and round_number < self.max_rounds:
+            self.logger.info(f"{request.title} moved away from its target, retrying (round {round_number + 1}/{self.max_rounds})")
+        return request.result
+
+    def _log_failure(self, request):
+        config = request.config
+        initial_pos = request.initial_pos
+        current_pos = request.final_pos
+        self.logger.warning(f"Position verification failed for {request.title}:")
+        self.logger.warning(f"Initial position: x={initial_pos['left']}, y={initial_pos['top']}, w={initial_pos['width']}, h={initial_pos['height']}")
+        self.logger.warning(f"Target position: x={config['x']}, y={config['y']}, w={config['width']}, h={config['height']}")
+        self.logger.warning(f"Final position: x={current_pos['left']}, y={current_pos['top']}, w={current_pos['width']}, h={current_pos['height']}")
+        self.logger.warning(f"Mismatches: {', '.join(self.mismatches(request, current_pos))}")
@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+from organiser.assignment import assign_slots
+
+PLACED = "placed"  # Open and already within tolerance of its target
+MOVE = "move"  # Open somewhere else
+LAUNCH = "launch"  # Not open; the organiser will launch it
+UNRESOLVABLE = "unresolvable"  # Not open and nothing to launch it with
+
+PlanEntry = namedtuple("PlanEntry", ["title", "action", "windows", "detail"])
+
+
+def _within(rect, target, tolerance):
+    return all(abs(value - wanted) <= tolerance for value, wanted in zip(rect, target))
+
+
+def _target(config):
+    return config["x"], config["y"], config["width"], config["height"]
+
+
+def plan_layout(window_configs, snapshot, matcher, backend, tolerance=2):
+    """Classify every config against one desktop snapshot, in config order.
+
+    Only the windows the configs match are measured (one rectangle read
+    each), so a plan costs one enumeration plus a handful of native calls.
+    """
+    assignment = matcher.assign(snapshot)
+    entries = []
+    for title, config in window_configs.items():
+        if config.get("slots"):
+            entries.append(_plan_slots(title, config, snapshot, matcher, backend, tolerance))
+            continue
+        match = assignment.get(title)
+        if match:
+            try:
+                rect = backend.get_window_rect(match.window._hWnd)
+            except Exception as e:
+                entries.append(PlanEntry(title, MOVE, [match.window], f"could not read its position: {e}"))
+                continue
+            target = _target(config)
+            if _within(rect, target, tolerance):
+                entries.append(PlanEntry(title, PLACED, [match.window], f"at {rect}"))
+            else:
+                entries.append(PlanEntry(title, MOVE, [match.window], f"{rect} -> {target}"))
+            continue
+        entries.append(_plan_missing(title, config))
+    return entries
+
+
+def _plan_slots(title, config, snapshot, matcher, backend, tolerance):
+    windows = matcher.matching_windows(snapshot, title)
+    if not windows:
+        return _plan_missing(title, config)
+    rects = []
+    for window in windows:
+        try:
+            rects.append(backend.get_window_rect(window._hWnd))
+        except Exception as e:
+            return PlanEntry(title, MOVE, windows, f"could not read a position: {e}")
+    slots = config["slots"]
+    assignment = assign_slots(rects, slots)
+    moves = sum(1 for index, slot in assignment.items() if not _within(rects[index], _target(slots[slot]), tolerance))
+    detail = f"{len(windows)} windows for {len(slots)} slots"
+    if moves:
+        return PlanEntry(title, MOVE, windows, f"{detail}, {moves} to move")
+    return PlanEntry(title, PLACED, windows, detail)
+
+
+def _plan_missing(title, config):
+    if config.get("position_only"):
+        return PlanEntry(title, UNRESOLVABLE, [], "position_only: waits for the window to be opened")
+    if config.get("opening_method") or config.get("open_method") or config.get("app_name"):
+        method = config.get("opening_method") or config.get("open_method") or "default"
+        return PlanEntry(title, LAUNCH, [], f"{config.get('app_name', '')} ({method})")
+    return PlanEntry(title, UNRESOLVABLE, [], "no app_name to launch")
+
+
+def format_plan(entries):
+    """One line per config, for --dry-run"""
+    width = max((len(entry.title) for entry in entries), default=0)
+    lines = [f"{entry.action:<13} {entry.title:<{width}}  {entry.detail}" for entry in entries]
+    counts = {}
+    for entry in entries:
+        counts[entry.action] = counts.get(entry.action, 0) + 1
+    lines.append(", ".join(f"{count} {action}" for action, count in counts.items()) or "No configs")
+    return "\n".join(lines)
@@ -0,0 +1,93 @@
+import threading
+
+
+class ProcessWindowIndex:
+    """Process ID -> windows index, kept up to date from desktop snapshots.
+
+    Each snapshot only costs a PID lookup for handles not seen before, so
+    windows reported by events are bound on the next check without any
+    enumeration. Launched processes are tracked together with their
+    descendants, because launcher stubs (``msedge_proxy.exe``, Squirrel's
+    ``Update.exe``) exit after starting the process that owns the window.
+    """
+
+    def __init__(self, backend, logger=None):
+        self.backend = backend
+        self.logger = logger
+        self.pid_of = {}
+        self.windows_of = {}
+        self.lookups = 0
+        self._snapshot = None
+        self._parents = None
+        self._parents_tick = None
+        self._lock = threading.Lock()
+
+    def update(self, snapshot):
+        """Fold a snapshot into the index: look up new handles, drop closed ones"""
+        with self._lock:
+            if snapshot is self._snapshot:
+                return
+            self._snapshot = snapshot
+            handles = snapshot.by_handle
+            for hwnd in [hwnd for hwnd in self.pid_of if hwnd not in handles]:
+                pid = self.pid_of.pop(hwnd)
+                self.windows_of[pid].discard(hwnd)
+                if not self.windows_of[pid]:
+                    del self.windows_of[pid]
+            for hwnd in handles:
+                if hwnd in self.pid_of:
+                    continue
+                try:
+                    pid = self.backend.window_pid(hwnd)
+                except Exception:
+                    continue
+                self.lookups += 1
+                self.pid_of[hwnd] = pid
+                self.windows_of.setdefault(pid, set()).add(hwnd)
+
+    def family(self, pid, tick=None):
+        """``pid`` and every process descended from it.
+
+        The process table is read at most once per ``tick``, and only while
+        some launched process has no window yet.
+        """
+        with self._lock:
+            if self._parents is None or tick is None or tick != self._parents_tick:
+                try:
+                    self._parents = self.backend.process_parents()
+                except Exception as e:
+                    if self.logger:
+                        self.logger.warning(f"Could not list processes: {e}")
+                    self._parents = {}
+                self._parents_tick = tick
+            parents = self._parents
+        children = {}
+        for child, parent in parents.items():
+            if child != parent:
+                children.setdefault(parent, []).append(child)
+        family = {pid}
+        stack = [pid]
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in family:
+                    family.add(child)
+                    stack.append(child)
+        return family
+
+    def window_for(self, snapshot, pid):
+        """Topmost window in ``snapshot`` owned by ``pid`` or one of its descendants"""
+        windows = self.windows_for(snapshot, pid)
+        return windows[0] if windows else None
+
+    def windows_for(self, snapshot, pid):
+        """Windows in ``snapshot`` owned by ``pid`` or one of its descendants, topmost first"""
+        self.update(snapshot)
+        with self._lock:
+            own = self.windows_of.get(pid)
+        if not own:
+            family = self.family(pid, snapshot.tick)
+            with self._lock:
+                own = set().union(*(self.windows_of.get(member, ()) for member in family))
+        if not own:
+            return []
+        return [window for window in snapshot.windows if window._hWnd in own]
@@ -0,0 +1,125 @@
+import time
+
+from organiser.launch_stats import percentile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    wall_s REAL NOT NULL,
+    trigger TEXT,
+    apps INTEGER NOT NULL,
+    succeeded INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS app_runs (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    title TEXT NOT NULL,
+    action TEXT,
+    method TEXT,
+    appeared_s REAL,
+    success INTEGER NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    elapsed_s REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS app_runs_run_id ON app_runs(run_id);
+"""
+
+
+class RunHistory:
+    """One compact record per organise run, appended to a local SQLite database.
+
+    Each run stores its start time, wall-clock time and trigger; each app
+    its planned action, launch method, seconds until its window appeared,
+    placement result and retries. sqlite3 is imported on first use, after
+    the run, so it costs nothing on the startup path.
+    """
+
+    def __init__(self, path="organizer_history.sqlite", logger=None):
+        self.path = path
+        self.logger = logger
+
+    def _connect(self):
+        import sqlite3
+
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def record(self, results, wall_s, trigger=None, started_at=None):
+        """Append a run and its per-app results (AppResults); errors are logged, never raised"""
+        started_at = started_at if started_at is not None else time.time() - wall_s
+        rows = []
+        for result in results:
+            details = result.details or {}
+            rows.append((result.title, details.get("action"), details.get("method"), details.get("appeared_after"),
+                         int(result.success), details.get("retries", 0), round(result.elapsed, 3)))
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    cursor = connection.execute(
+                        "INSERT INTO runs (started_at, wall_s, trigger, apps, succeeded) VALUES (?, ?, ?, ?, ?)",
+                        (started_at, round(wall_s, 3), trigger, len(results),
+                         sum(1 for result in results if result.success)))
+                    connection.executemany(
+                        "INSERT INTO app_runs (run_id, title, action, method, appeared_s, success, retries, elapsed_s)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(cursor.lastrowid,) + row for row in rows])
+            finally:
+                connection.close()
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Could not record run in {self.path}: {e}")
+
+    def runs(self, since=None, until=None):
+        """Runs started in [since, until) (Unix times), oldest first, as dicts"""
+        return self._query("SELECT * FROM runs WHERE started_at >= ? AND started_at < ? ORDER BY started_at",
+                           since, until)
+
+    def app_runs(self, since=None, until=None):
+        """Per-app records of the runs started in [since, until), oldest first, as dicts"""
+        return self._query("SELECT app_runs.*, runs.started_at FROM app_runs JOIN runs ON runs.id = app_runs.run_id"
+                           " WHERE runs.started_at >= ? AND runs.started_at < ? ORDER BY runs.started_at",
+                           since, until)
+
+    def _query(self, sql, since, until):
+        connection = self._connect()
+        try:
+            connection.row_factory = lambda cursor, row: {column[0]: value for column, value in zip(cursor.description, row)}
+            return connection.execute(sql, (since or 0, until or float("inf"))).fetchall()
+        finally:
+            connection.close()
+
+
+def distribution(values):
+    """p50/p95/max of a list of numbers, or None for an empty list"""
+    if not values:
+        return None
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95), "max": max(values)}
+
+
+def summarise_apps(app_runs):
+    """Per-app statistics over a set of app records, keyed by title"""
+    by_title = {}
+    for row in app_runs:
+        by_title.setdefault(row["title"], []).append(row)
+    summary = {}
+    for title, rows in by_title.items():
+        failures = sum(1 for row in rows if not row["success"])
+        methods = {}
+        for row in rows:
+            if row["method"]:
+                methods[row["method"]] = methods.get(row["method"], 0) + 1
+        summary[title] = {
+            "runs": len(rows),
+            "failures": failures,
+            "failure_rate": failures / len(rows),
+            "appeared_s": distribution([row["appeared_s"] for row in rows if row["appeared_s"] is not None]),
+            "elapsed_s": distribution([row["elapsed_s"] for row in rows]),
+            "retries": sum(row["retries"] for row in rows),
+            "methods": methods,
+        }
+    return summary
@@ -0,0 +1,177 @@
+import itertools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StaticLoadSignal:
+    """Load signal that reports whatever ``value`` is set to; for tests and benchmarks"""
+
+    def __init__(self, value=0.0):
+        self.value = value
+
+    def read(self):
+        return self.value
+
+
+class ProcLoadSignal:
+    """System pressure from /proc: the larger of CPU busy share and IO pressure (0..1).
+
+    CPU busy share is measured between consecutive reads from /proc/stat; IO
+    pressure is the kernel's PSI ``some avg10`` from /proc/pressure/io, when
+    the kernel provides it.
+    """
+
+    def __init__(self):
+        self._last = self._cpu_times()
+
+    @staticmethod
+    def _cpu_times():
+        with open("/proc/stat", 'r') as f:
+            values = [int(value) for value in f.readline().split()[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+        return idle, sum(values)
+
+    @staticmethod
+    def _io_pressure():
+        try:
+            with open("/proc/pressure/io", 'r') as f:
+                fields = dict(field.split("=") for field in f.readline().split()[1:])
+            return float(fields["avg10"]) / 100
+        except (OSError, KeyError, ValueError):
+            return 0.0
+
+    def read(self):
+        idle, total = self._cpu_times()
+        last_idle, last_total = self._last
+        self._last = idle, total
+        cpu = 1 - (idle - last_idle) / (total - last_total) if total > last_total else 0.0
+        return max(cpu, self._io_pressure())
+
+
+class WindowsLoadSignal:
+    """CPU busy share between consecutive reads, from GetSystemTimes (0..1)"""
+
+    def __init__(self):
+        self._last = self._system_times()
+
+    @staticmethod
+    def _system_times():
+        import ctypes
+        from ctypes import wintypes
+
+        idle, kernel, user = wintypes.FILETIME(), wintypes.FILETIME(), wintypes.FILETIME()
+        if not ctypes.windll.kernel32.GetSystemTimes(ctypes.byref(idle), ctypes.byref(kernel), ctypes.byref(user)):
+            raise ctypes.WinError()
+
+        def ticks(filetime):
+            return (filetime.dwHighDateTime << 32) | filetime.dwLowDateTime
+
+        # Kernel time includes idle time
+        return ticks(idle), ticks(kernel) + ticks(user)
+
+    def read(self):
+        idle, total = self._system_times()
+        last_idle, last_total = self._last
+        self._last = idle, total
+        return 1 - (idle - last_idle) / (total - last_total) if total > last_total else 0.0
+
+
+def default_load_signal():
+    """The platform's load signal, or None when it can't be read"""
+    try:
+        if sys.platform == "win32":
+            return WindowsLoadSignal()
+        return ProcLoadSignal()
+    except Exception:
+        return None
+
+
+class LaunchScheduler:
+    """Decides which waiting launch may start next.
+
+    Launches are admitted highest ``priority`` first. A launch whose
+    ``weight`` is above 1 (a heavy app, e.g. Electron) is only admitted while
+    the load signal stays under ``threshold``; a lighter launch further back
+    may start in the meantime. ``capacity`` caps the total weight of launches
+    in flight. Whatever the load, a launch is always admitted when nothing
+    else is in flight, so the run keeps making progress.
+    """
+
+    def __init__(self, load_signal=None, threshold=0.85, capacity=None, poll_interval=0.25, logger=None):
+        self.load_signal = load_signal
+        self.threshold = threshold
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.logger = logger
+        self.in_flight = 0.0
+        self.launching = 0
+        self.deferrals = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._load = 0.0
+        self._load_read_at = None
+        self._changed = threading.Condition()
+
+    def load(self):
+        """Current pressure, read at most once per poll interval"""
+        now = time.monotonic()
+        if self.load_signal and (self._load_read_at is None or now - self._load_read_at >= self.poll_interval):
+            try:
+                self._load = self.load_signal.read()
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"Load signal unavailable, ignoring system load: {e}")
+                self.load_signal = None
+                self._load = 0.0
+            self._load_read_at = now
+        return self._load
+
+    def _fits(self, weight):
+        if self.launching == 0:
+            return True
+        if self.capacity is not None and self.in_flight + weight > self.capacity:
+            return False
+        return weight <= 1 or self.load() < self.threshold
+
+    def _next(self):
+        """The best waiting launch that may start now"""
+        for entry in sorted(self._waiting):
+            if self._fits(entry[2]):
+                return entry
+        return None
+
+    @contextmanager
+    def slot(self, priority=0, weight=1, cancelled=None):
+        """Hold a launch slot for the body; yields False if ``cancelled`` was set while queued"""
+        weight = max(0.0, float(weight))
+        entry = (-priority, next(self._sequence), weight)
+        admitted = True
+        with self._changed:
+            self._waiting.append(entry)
+            deferred = False
+            try:
+                while self._next() is not entry:
+                    if cancelled is not None and cancelled.is_set():
+                        admitted = False
+                        break
+                    deferred = True
+                    self._changed.wait(self.poll_interval)
+            finally:
+                self._waiting.remove(entry)
+                self._changed.notify_all()
+            if admitted:
+                self.deferrals += deferred
+                self.in_flight += weight
+                self.launching += 1
+        if not admitted:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            with self._changed:
+                self.in_flight -= weight
+                self.launching -= 1
+                self._changed.notify_all()
@@ -0,0 +1,266 @@
+import math
+import random
+import threading
+from collections import Counter
+
+
+def fixed(seconds):
+    return lambda rng: seconds
+
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median, sigma=0.5):
+    """Launch latencies with a long right tail, like real cold starts"""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+class SimulatedApp:
+    """How a simulated app behaves when it is launched.
+
+    ``latency`` is seconds until the first window appears, or a callable
+    taking a ``random.Random`` (see ``uniform``/``lognormal``) sampled per
+    launch. ``final_title`` replaces ``title`` ``rename_after`` seconds later,
+    ``windows`` opens that many windows with the same title, ``snap_back``
+    makes each window jump back to where it was after its first N moves, and
+    ``failure`` is ``"error"`` (the launch raises) or ``"hang"`` (it
+    succeeds but no window ever appears). ``stub`` makes the launched
+    process a launcher stub whose window belongs to a child process.
+    """
+
+    def __init__(self, title, latency=0.5, final_title=None, rename_after=0.2, windows=1,
+                 snap_back=0, failure=None, stub=False, process="app.exe"):
+        self.title = title
+        self.latency = latency if callable(latency) else fixed(latency)
+        self.final_title = final_title
+        self.rename_after = rename_after
+        self.windows = windows
+        self.snap_back = snap_back
+        self.failure = failure
+        self.stub = stub
+        self.process = process
+
+
+class SimulatedWindow:
+    """In-memory stand-in for a pygetwindow window"""
+
+    def __init__(self, hwnd, title, left=0, top=0, width=800, height=600, process="app.exe",
+                 class_name="SimulatedWindow", pid=0, snap_back=0):
+        self._hWnd = hwnd
+        self.title = title
+        self.pid = pid
+        self.process = process
+        self.class_name = class_name
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.snap_back = snap_back
+
+    @property
+    def rect(self):
+        return self.left, self.top, self.width, self.height
+
+    def resizeTo(self, width, height):
+        self.width = width
+        self.height = height
+
+    def moveTo(self, x, y):
+        self.left = x
+        self.top = y
+
+    def __repr__(self):
+        return f"SimulatedWindow({self._hWnd}, {self.title!r})"
+
+
+class SimulatedProcess:
+    """What SimulatedBackend.spawn returns in place of a Popen object"""
+
+    def __init__(self, pid):
+        self.pid = pid
+
+
+class SimulatedBackend:
+    """Fake desktop for exercising the organiser without Windows.
+
+    ``apps`` maps an app name (as passed to AppOpener or found in a launch
+    command) to a SimulatedApp, or to the shorthand ``(window_title,
+    latency_seconds[, stub])``. Launching an app makes its windows visible
+    once the sampled latency has elapsed, and reports them to
+    ``event_source`` (a FakeEventSource) when one is given.
+
+    Every call that would be a Win32 call on the real backend is counted in
+    ``calls`` by method name, so benchmarks can compare native call counts.
+    """
+
+    SNAP_BACK_DELAY = 0.05  # How long after a move a snapping window jumps back
+
+    def __init__(self, apps=None, event_source=None, seed=0):
+        self.apps = {}
+        for name, app in (apps or {}).items():
+            self.add_app(name, app)
+        self.event_source = event_source
+        self.rng = random.Random(seed)
+        self.windows = []
+        self.launches = []
+        self.calls = Counter()
+        self.parents = {}
+        self.display = (1, 0, 0, 1920, 1080)
+        self._by_handle = {}
+        self._next_hwnd = 0x1000
+        self._next_pid = 1000
+        self._lock = threading.Lock()
+
+    @property
+    def native_calls(self):
+        return sum(self.calls.values())
+
+    def add_app(self, name, app):
+        if not isinstance(app, SimulatedApp):
+            app = SimulatedApp(app[0], app[1], stub=len(app) > 2 and app[2])
+        self.apps[name] = app
+
+    def add_window(self, title, **attributes):
+        """Create a window that is visible immediately"""
+        with self._lock:
+            return self._create_window(title, **attributes)
+
+    def _create_process(self, parent=0):
+        self._next_pid += 4
+        self.parents[self._next_pid] = parent
+        return self._next_pid
+
+    def _create_window(self, title, **attributes):
+        self._next_hwnd += 4
+        if "pid" not in attributes:
+            attributes["pid"] = self._create_process()
+        window = SimulatedWindow(self._next_hwnd, title, **attributes)
+        self.windows.append(window)
+        self._by_handle[window._hWnd] = window
+        return window
+
+    def close_window(self, window):
+        with self._lock:
+            self.windows.remove(window)
+            del self._by_handle[window._hWnd]
+
+    def _appear(self, app, pid):
+        with self._lock:
+            windows = [self._create_window(app.title, pid=pid, process=app.process, snap_back=app.snap_back)
+                       for _ in range(app.windows)]
+        for window in windows:
+            if self.event_source:
+                self.event_source.emit(window._hWnd, window.title)
+            if app.final_title:
+                self._later(app.rename_after, self.rename, window, app.final_title)
+
+    def _later(self, delay, function, *args):
+        timer = threading.Timer(delay, function, args=args)
+        timer.daemon = True
+        timer.start()
+
+    def rename(self, window, title):
+        """Change a window's title, as apps do once they finish loading"""
+        window.title = title
+        if self.event_source:
+            self.event_source.emit(window._hWnd, title)
+
+    def get_all_windows(self):
+        with self._lock:
+            self.calls["get_all_windows"] += 1
+            return list(self.windows)
+
+    def get_windows_with_title(self, title):
+        return [w for w in self.get_all_windows() if title.upper() in w.title.upper()]
+
+    def apply_placements(self, placements):
+        with self._lock:
+            self.calls["apply_placements"] += 1
+            live = set(id(window) for window in self.windows)
+        errors = []
+        for window, x, y, width, height in placements:
+            if id(window) not in live:
+                errors.append(OSError(f"Invalid window handle {window._hWnd}"))
+                continue
+            previous = window.rect
+            window.left, window.top, window.width, window.height = x, y, width, height
+            if window.snap_back:
+                window.snap_back -= 1
+                self._later(self.SNAP_BACK_DELAY, self._snap, window, previous)
+            errors.append(None)
+        return errors
+
+    def _snap(self, window, rect):
+        window.left, window.top, window.width, window.height = rect
+
+    def window_for_handle(self, hwnd):
+        with self._lock:
+            window = self._by_handle.get(hwnd)
+        if window is None:
+            raise LookupError(f"No window with handle {hwnd}")
+        return window
+
+    def _native(self, name, hwnd):
+        with self._lock:
+            self.calls[name] += 1
+        return self.window_for_handle(hwnd)
+
+    def get_window_rect(self, hwnd):
+        return self._native("get_window_rect", hwnd).rect
+
+    def window_process_name(self, hwnd):
+        return self._native("window_process_name", hwnd).process
+
+    def window_class_name(self, hwnd):
+        return self._native("window_class_name", hwnd).class_name
+
+    def window_pid(self, hwnd):
+        return self._native("window_pid", hwnd).pid
+
+    def display_signature(self):
+        return self.display
+
+    def ui_ready(self):
+        return True
+
+    def process_parents(self):
+        with self._lock:
+            self.calls["process_parents"] += 1
+            return dict(self.parents)
+
+    def _launch(self, app_name):
+        with self._lock:
+            self.calls["launch"] += 1
+            self.launches.append(app_name)
+            app = self.apps.get(app_name)
+            if app is None:
+                raise RuntimeError(f"Unknown app: {app_name}")
+            if app.failure == "error":
+                raise RuntimeError(f"{app_name} failed to start")
+            pid = self._create_process()
+            window_pid = self._create_process(parent=pid) if app.stub else pid
+            latency = app.latency(self.rng)
+        if app.failure != "hang":
+            self._later(latency, self._appear, app, window_pid)
+        return pid
+
+    def open_app(self, app_name):
+        self._launch(app_name)
+
+    def resolve_app(self, query):
+        return f"sim:{query}" if query in self.apps else None
+
+    def app_command_exists(self, command):
+        return not command.startswith("sim:") or command[len("sim:"):] in self.apps
+
+    def run_command(self, command):
+        if command.startswith("sim:"):
+            self._launch(command[len("sim:"):])
+        else:
+            self._launch(command.replace("start ", "", 1))
+
+    def spawn(self, command_line):
+        return SimulatedProcess(self._launch(command_line))
@@ -0,0 +1,133 @@
+import threading
+import time
+
+
+class WindowSnapshot:
+    """One enumeration of the desktop, indexed by title and by window handle.
+
+    Each window's title is read once, here, and stored by handle: a live
+    window's ``.title`` is a GetWindowText call on every access. ``titles``
+    carries already-known titles over (e.g. from the previous snapshot) so
+    they are not read again.
+    """
+
+    def __init__(self, windows, tick=0, titles=None):
+        self.windows = list(windows)
+        self.tick = tick
+        self.taken_at = time.monotonic()
+        self.by_handle = {}
+        self.by_title = {}
+        self.title_by_handle = {}
+        known = titles or {}
+        for window in self.windows:
+            hwnd = window._hWnd
+            title = known[hwnd] if hwnd in known else window.title
+            self.by_handle[hwnd] = window
+            self.title_by_handle[hwnd] = title
+            if title:
+                self.by_title.setdefault(title, []).append(window)
+        self._upper_titles = [(title.upper(), window) for title, window in
+                              ((self.title_of(window), window) for window in self.windows) if title]
+        self._found = {}
+
+    def find(self, title):
+        """Windows whose title contains ``title`` (case-insensitive, like pygetwindow)"""
+        found = self._found.get(title)
+        if found is None:
+            needle = title.upper()
+            found = [window for upper, window in self._upper_titles if needle in upper]
+            self._found[title] = found
+        return found
+
+    def get(self, hwnd):
+        return self.by_handle.get(hwnd)
+
+    def title_of(self, window):
+        """The title ``window`` had when the snapshot was taken"""
+        return self.title_by_handle.get(window._hWnd, "")
+
+    def titles(self):
+        return [title for title in (self.title_of(window) for window in self.windows) if title]
+
+
+class DesktopIndex:
+    """Shares a single desktop enumeration per polling tick between all waiters.
+
+    Ticks are aligned to the index's creation time, so threads polling with
+    the same interval wake together and reuse the snapshot built by whichever
+    of them arrives first. ``enumerations`` therefore grows with the number of
+    ticks, not with apps x ticks.
+    """
+
+    def __init__(self, backend, tick_interval=1.0):
+        self.backend = backend
+        self.tick_interval = tick_interval
+        self.enumerations = 0
+        self.lookups = 0
+        self._epoch = time.monotonic()
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _current_tick(self):
+        return int((time.monotonic() - self._epoch) / self.tick_interval)
+
+    def _enumerate(self, tick):
+        self._snapshot = WindowSnapshot(self.backend.get_all_windows(), tick)
+        self.enumerations += 1
+        return self._snapshot
+
+    def snapshot(self):
+        """Snapshot for the current tick, enumerating only if none exists yet"""
+        tick = self._current_tick()
+        with self._lock:
+            if self._snapshot is None or self._snapshot.tick < tick:
+                return self._enumerate(tick)
+            return self._snapshot
+
+    def refresh(self):
+        """Force a fresh enumeration, e.g. after windows were moved"""
+        with self._lock:
+            return self._enumerate(self._current_tick())
+
+    def note_window(self, hwnd, title):
+        """Fold a window reported by an event into the current snapshot without enumerating"""
+        with self._lock:
+            if self._snapshot is None:
+                return
+            window = self._snapshot.get(hwnd) or self.backend.window_for_handle(hwnd)
+            windows = [w for w in self._snapshot.windows if w._hWnd != hwnd]
+            windows.insert(0, window)
+            titles = dict(self._snapshot.title_by_handle)
+            if title is not None:
+                titles[hwnd] = title  # The event already carries the new title
+            else:
+                titles.pop(hwnd, None)
+            self._snapshot = WindowSnapshot(windows, self._snapshot.tick, titles)
+
+    def time_to_next_tick(self, interval=None):
+        """Seconds until the next boundary of ``interval`` (rounded to whole ticks).
+
+        Waiters with different poll intervals still wake on shared boundaries,
+        so a slow poller always lands on a tick a fast poller also uses.
+        """
+        ticks = max(1, int(round((interval or self.tick_interval) / self.tick_interval)))
+        interval = ticks * self.tick_interval
+        elapsed = time.monotonic() - self._epoch
+        next_boundary = (int(elapsed / interval) + 1) * interval
+        return max(0.0, next_boundary - elapsed)
+
+    def wait_for_next_tick(self):
+        """Sleep until the next shared tick boundary and return its snapshot"""
+        time.sleep(self.time_to_next_tick())
+        return self.snapshot()
+
+    def find(self, title):
+        self.lookups += 1
+        return self.snapshot().find(title)
+
+    def stats(self):
+        return {
+            "enumerations": self.enumerations,
+            "ticks": self._current_tick() + 1,
+            "lookups": self.lookups,
+        }
@@ -0,0 +1,199 @@
+import re
+import threading
+
+
+TITLE_KINDS = ("exact", "prefix", "suffix", "contains", "regex")
+WINDOW_KINDS = ("process", "class")
+RULE_KINDS = TITLE_KINDS + WINDOW_KINDS
+
+
+class MatchRule:
+    """One compiled way of recognising a config's window.
+
+    Title rules compare case-insensitively, like pygetwindow's title lookup;
+    ``regex`` rules are searched (not anchored) with IGNORECASE. ``process``
+    matches the executable name (e.g. ``Discord.exe``) and ``class`` the
+    window class name.
+    """
+
+    def __init__(self, kind, value):
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown match rule '{kind}'")
+        self.kind = kind
+        self.value = value
+        self.needle = value.upper()
+        self.pattern = re.compile(value, re.IGNORECASE) if kind == "regex" else None
+
+    def __str__(self):
+        return f"{self.kind} {self.value!r}"
+
+    def __repr__(self):
+        return f"MatchRule({self.kind!r}, {self.value!r})"
+
+
+class WindowMatch:
+    """A window assigned to a config, and the rule that picked it"""
+
+    def __init__(self, window, rule):
+        self.window = window
+        self.rule = rule
+
+    def __repr__(self):
+        return f"WindowMatch({self.window!r}, {self.rule})"
+
+
+def compile_rules(title, config):
+    """Match rules for a config, in priority order.
+
+    ``config["match"]`` may be a list of single-key dicts such as
+    ``[{"suffix": " - Discord"}, {"process": "Discord.exe"}]``, one such
+    dict, or a plain string (a ``contains`` rule). Without it the config
+    matches the way it always has: its title, then its original_title, as
+    case-insensitive substrings.
+    """
+    spec = config.get("match")
+    if not spec:
+        rules = [MatchRule("contains", title)]
+        original_title = config.get("original_title")
+        if original_title and original_title != title:
+            rules.append(MatchRule("contains", original_title))
+        return rules
+    if isinstance(spec, (str, dict)):
+        spec = [spec]
+    rules = []
+    for entry in spec:
+        if isinstance(entry, str):
+            entry = {"contains": entry}
+        for kind, value in entry.items():
+            rules.append(MatchRule(kind, str(value)))
+    return rules
+
+
+class TitleMatcher:
+    """Assigns windows to every pending config in one pass over a snapshot.
+
+    Rules are compiled once and indexed by kind: exact titles, prefixes and
+    suffixes become dict lookups keyed by the title (or its first/last N
+    characters), ``contains`` needles are screened by a single alternation
+    regex, regex rules are screened by one combined pattern and process/class
+    rules are looked up by the window's attribute. Each config is then given its
+    best window (earliest rule, then topmost window) that no earlier config
+    has already claimed, so two configs never fight over one window.
+    """
+
+    def __init__(self, window_configs, backend=None, logger=None):
+        self.backend = backend
+        self.logger = logger
+        self.order = []
+        self.rules = {}
+        self._exact = {}
+        self._prefix = {}
+        self._suffix = {}
+        self._contains = []
+        self._regex = []
+        self._attributes = {kind: {} for kind in WINDOW_KINDS}
+        for key, config in window_configs.items():
+            self.add(key, config)
+        self._contains_screen = None
+        if self._contains:
+            alternation = "|".join(sorted((re.escape(rule.needle) for _, _, rule in self._contains), key=len, reverse=True))
+            self._contains_screen = re.compile(alternation)
+        self._regex_screen = None
+        if len(self._regex) > 1:
+            try:
+                self._regex_screen = re.compile("|".join(f"(?:{rule.value})" for _, _, rule in self._regex), re.IGNORECASE)
+            except re.error:
+                pass  # e.g. backreferences that don't survive concatenation: try each pattern
+        self._window_attributes = {}
+        self._last = None
+        self._lock = threading.Lock()
+
+    def add(self, key, config):
+        try:
+            rules = compile_rules(key, config)
+        except (re.error, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Invalid match rule for {key}, using its title instead: {e}")
+            rules = compile_rules(key, {"original_title": config.get("original_title")})
+        self.order.append(key)
+        self.rules[key] = rules
+        for priority, rule in enumerate(rules):
+            entry = (key, priority, rule)
+            if rule.kind == "exact":
+                self._exact.setdefault(rule.needle, []).append(entry)
+            elif rule.kind == "prefix":
+                self._prefix.setdefault(len(rule.needle), {}).setdefault(rule.needle, []).append(entry)
+            elif rule.kind == "suffix":
+                self._suffix.setdefault(len(rule.needle), {}).setdefault(rule.needle, []).append(entry)
+            elif rule.kind == "contains":
+                self._contains.append(entry)
+            elif rule.kind == "regex":
+                self._regex.append(entry)
+            else:
+                self._attributes[rule.kind].setdefault(rule.needle, []).append(entry)
+
+    def window_attributes(self, window):
+        """Process and class name of a window, fetched once per handle and only when a rule needs them"""
+        attributes = self._window_attributes.get(window._hWnd)
+        if attributes is not None:
+            return attributes
+        attributes = {}
+        for kind, fetch in (("process", "window_process_name"), ("class", "window_class_name")):
+            if self._attributes[kind] and self.backend:
+                try:
+                    attributes[kind] = getattr(self.backend, fetch)(window._hWnd) or ""
+                except Exception:
+                    attributes[kind] = ""
+        self._window_attributes[window._hWnd] = attributes
+        return attributes
+
+    def candidates(self, window, title):
+        """Every (key, priority, rule) whose rule matches ``window``, titled ``title`` in the snapshot"""
+        title = title or ""
+        upper = title.upper()
+        found = list(self._exact.get(upper, ()))
+        for length, needles in self._prefix.items():
+            found.extend(needles.get(upper[:length], ()))
+        for length, needles in self._suffix.items():
+            if length <= len(upper):
+                found.extend(needles.get(upper[len(upper) - length:], ()))
+        if self._contains_screen and self._contains_screen.search(upper):
+            found.extend(entry for entry in self._contains if entry[2].needle in upper)
+        if self._regex and (self._regex_screen is None or self._regex_screen.search(title)):
+            found.extend(entry for entry in self._regex if entry[2].pattern.search(title))
+        if self._attributes["process"] or self._attributes["class"]:
+            for kind, value in self.window_attributes(window).items():
+                found.extend(self._attributes[kind].get(value.upper(), ()))
+        return found
+
+    def assign(self, snapshot, pending=None):
+        """Map each pending config key to a WindowMatch (or leave it out when nothing matches).
+
+        Results are memoised for the last (snapshot, pending) pair, so every
+        waiter polling the same tick shares one pass over the windows.
+        """
+        pending = frozenset(self.order if pending is None else pending)
+        with self._lock:
+            if self._last and self._last[0] is snapshot and self._last[1] == pending:
+                return self._last[2]
+            best = {}
+            for z_order, window in enumerate(snapshot.windows):
+                for key, priority, rule in self.candidates(window, snapshot.title_of(window)):
+                    if key in pending:
+                        best.setdefault(key, []).append((priority, z_order, window, rule))
+            claimed = set()
+            assignment = {}
+            for key in self.order:
+                for priority, z_order, window, rule in sorted(best.get(key, ()), key=lambda c: c[:2]):
+                    if window._hWnd not in claimed:
+                        claimed.add(window._hWnd)
+                        assignment[key] = WindowMatch(window, rule)
+                        break
+            self._last = (snapshot, pending, assignment)
+            return assignment
+
+    def matching_windows(self, snapshot, key, pending=None):
+        """Every window ``key``'s rules match, topmost first, except windows assigned to other pending configs"""
+        taken = set(match.window._hWnd for other, match in self.assign(snapshot, pending).items() if other != key)
+        return [window for window in snapshot.windows
+                if window._hWnd not in taken and any(entry[0] == key for entry in self.candidates(window, snapshot.title_of(window)))]
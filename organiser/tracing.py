@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def rotate(path, backup_count):
+    """Shift ``path`` to ``path.1``, ``path.1`` to ``path.2`` and so on, dropping the oldest, as RotatingFileHandler does"""
+    if backup_count <= 0:
+        os.remove(path)
+        return
+    for index in range(backup_count - 1, 0, -1):
+        source = f"{path}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{path}.{index + 1}")
+    os.replace(path, f"{path}.1")
+
+
+class Tracer:
+    """Collects timed spans for one organise run.
+
+    Recording a span is a perf_counter pair and a list append, so tracing
+    stays on permanently. Spans are exported as Chrome trace-event JSON
+    (open in chrome://tracing or https://ui.perfetto.dev) and as JSONL lines
+    appended to a history file, which rotates like the text logs.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.thread_names = {}
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, cat="organiser", **args):
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self._record(name, cat, start, time.perf_counter() - start, args)
+
+    def instant(self, name, cat="organiser", **args):
+        self._record(name, cat, time.perf_counter(), None, args)
+
+    def _record(self, name, cat, start, duration, args):
+        thread = threading.current_thread()
+        self.thread_names[thread.ident] = thread.name
+        self.events.append((name, cat, start - self._origin, duration, thread.ident, args))
+
+    def chrome_events(self):
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self.thread_names.items()
+        ]
+        for name, cat, start, duration, tid, args in list(self.events):
+            event = {"name": name, "cat": cat, "ts": round(start * 1e6, 1),
+                     "pid": self.pid, "tid": tid, "args": args}
+            if duration is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=round(duration * 1e6, 1))
+            events.append(event)
+        return events
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms"}, f)
+
+    def append_jsonl(self, path, max_bytes=1_000_000, backup_count=3):
+        """Append this run's spans; a file that has reached ``max_bytes`` is rotated first, so a run is never split"""
+        run = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at))
+        try:
+            full = os.path.getsize(path) >= max_bytes
+        except OSError:
+            full = False
+        if full:
+            rotate(path, backup_count)
+        with open(path, 'a', encoding='utf-8') as f:
+            for name, cat, start, duration, tid, args in list(self.events):
+                f.write(json.dumps({
+                    "run": run,
+                    "name": name,
+                    "cat": cat,
+                    "start": round(start, 4),
+                    "dur": None if duration is None else round(duration, 4),
+                    "thread": self.thread_names.get(tid, str(tid)),
+                    "args": args,
+                }, ensure_ascii=False) + "\n")
+
+    def export(self, trace_path, history_path, logger=None, max_bytes=1_000_000, backup_count=3):
+        """Write both formats, never letting a tracing failure break the run"""
+        try:
+            self.write_chrome_trace(trace_path)
+            self.append_jsonl(history_path, max_bytes, backup_count)
+        except Exception as e:
+            if logger:
+                logger.warning(f"Could not write trace files: {e}")
@@ -0,0 +1,158 @@
+import sys
+import threading
+
+
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_NAMECHANGE = 0x800C
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+GA_ROOT = 2
+WM_QUIT = 0x0012
+
+
+class WindowWatcher:
+    """Wakes waiters the moment the event source reports a new or renamed window.
+
+    Events are folded straight into the DesktopIndex snapshot, so a waiter
+    woken by an event sees the window without another desktop enumeration.
+    Waiters still time out at the next tick boundary, which keeps polling as
+    a fallback for windows the event source misses.
+    """
+
+    def __init__(self, index, source):
+        self.index = index
+        self.source = source
+        self.events = 0
+        self.generation = 0
+        self._changed = threading.Condition()
+
+    def start(self):
+        self.source.start(self.on_window_event)
+        return self
+
+    def stop(self):
+        self.source.stop()
+
+    def on_window_event(self, hwnd, title):
+        self.index.note_window(hwnd, title)
+        with self._changed:
+            self.events += 1
+            self.generation += 1
+            self._changed.notify_all()
+
+    def wake(self):
+        """Wake every waiter without a window event, e.g. on cancellation"""
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, generation, timeout):
+        """Block until an event newer than ``generation`` arrives or ``timeout`` passes"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.generation != generation, timeout)
+
+
+class FakeEventSource:
+    """Event source driven by hand (or by SimulatedBackend) for tests on any OS"""
+
+    def __init__(self):
+        self._callback = None
+
+    def start(self, callback):
+        self._callback = callback
+
+    def stop(self):
+        self._callback = None
+
+    def emit(self, hwnd, title):
+        if self._callback:
+            self._callback(hwnd, title)
+
+
+class WinEventSource:
+    """Top-level window show/name-change events from SetWinEventHook.
+
+    Hooks are installed on a dedicated thread that pumps messages, as
+    out-of-context WinEvent callbacks are delivered through the message queue
+    of the thread that registered them.
+    """
+
+    EVENTS = (EVENT_OBJECT_SHOW, EVENT_OBJECT_NAMECHANGE)
+
+    def __init__(self):
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    @staticmethod
+    def available():
+        return sys.platform == "win32"
+
+    def start(self, callback):
+        """Install the hooks on a new thread; may be called again after stop(), once per daemon apply"""
+        self._callback = callback
+        self._ready.clear()
+        self._thread_id = None
+        self._thread = threading.Thread(target=self._run, name="winevent-hook", daemon=True)
+        self._thread.start()
+        self._ready.wait(1)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        # A run with nothing to wait for can stop before the hook thread is up; wait for it so it can't leak
+        self._ready.wait(5)
+        if self._thread_id:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(1)
+        self._thread = None
+        self._thread_id = None
+
+    def _run(self):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.GetAncestor.restype = wintypes.HWND
+
+        def handle_event(hook, event, hwnd, id_object, id_child, thread, timestamp):
+            if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+                return
+            if user32.GetAncestor(hwnd, GA_ROOT) != hwnd or not user32.IsWindowVisible(hwnd):
+                return
+            length = user32.GetWindowTextLengthW(hwnd)
+            buffer = ctypes.create_unicode_buffer(length + 1)
+            user32.GetWindowTextW(hwnd, buffer, length + 1)
+            if buffer.value:
+                try:
+                    self._callback(hwnd, buffer.value)
+                except Exception:
+                    pass  # Never let an exception unwind into user32
+
+        try:
+            # Keep a reference so the callback is not garbage collected while hooked
+            self._proc = WinEventProc(handle_event)
+            hooks = [
+                user32.SetWinEventHook(event, event, 0, self._proc, 0, 0,
+                                       WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+                for event in self.EVENTS
+            ]
+            self._thread_id = kernel32.GetCurrentThreadId()
+        finally:
+            self._ready.set()  # Also on failure, so stop() never waits for a thread that died
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            if hook:
+                user32.UnhookWinEvent(hook)
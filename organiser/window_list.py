@@ -0,0 +1,58 @@
+def window_pairs(backend):
+    """(handle, title) for every titled top-level window, in enumeration order"""
+    pairs = []
+    for window in backend.get_all_windows():
+        title = window.title
+        if title and title.strip():
+            pairs.append((window._hWnd, title))
+    return tuple(pairs)
+
+
+class WindowListModel:
+    """Rows shown in the Active Windows list, updated by diffing instead of rebuilding.
+
+    ``update`` compares a fresh set of (handle, title) pairs with the rows
+    currently shown and returns the minimal edits to apply to the listbox:
+    ``("delete", index)`` for windows that went away, ``("replace", index,
+    title)`` for windows that were renamed and ``("insert", index, title)``
+    for new ones, appended at the end so existing rows never move. Edits are
+    ordered so each index is valid at the time it is applied.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.pairs = ()
+        self.excluded = frozenset()
+
+    def handle_at(self, index):
+        return self.rows[index][0]
+
+    def update(self, pairs=None, excluded=None):
+        """Diff against new pairs and/or a new excluded-title set; returns the edits"""
+        pairs = self.pairs if pairs is None else tuple(pairs)
+        excluded = self.excluded if excluded is None else frozenset(excluded)
+        if pairs == self.pairs and excluded == self.excluded:
+            return []
+        self.pairs = pairs
+        self.excluded = excluded
+
+        wanted = {}
+        for hwnd, title in pairs:
+            if title not in excluded and hwnd not in wanted:
+                wanted[hwnd] = title
+
+        edits = []
+        for index in range(len(self.rows) - 1, -1, -1):
+            hwnd, title = self.rows[index]
+            if hwnd not in wanted:
+                del self.rows[index]
+                edits.append(("delete", index))
+        for index, (hwnd, title) in enumerate(self.rows):
+            new_title = wanted.pop(hwnd)
+            if new_title != title:
+                self.rows[index] = (hwnd, new_title)
+                edits.append(("replace", index, new_title))
+        for hwnd, title in wanted.items():
+            edits.append(("insert", len(self.rows), title))
+            self.rows.append((hwnd, title))
+        return edits
@@ -16,7 +16,7 @@ if not exist "venv" (
 )
 
 :: Run the window organizer using pythonw (no console window)
-start /b "" "venv\Scripts\pythonw.exe" window-organiser.pyw
+start /b "" "venv\Scripts\pythonw.exe" window-organiser.pyw %*
 
 :: Deactivate the virtual environment silently
 call venv\Scripts\deactivate.bat >nul 2>&1
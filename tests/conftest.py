@@ -0,0 +1,13 @@
+import logging
+import os
+import sys
+
+import pytest
+
+# The entry scripts aren't a package; make ``organiser`` importable from anywhere pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("organiser-tests")
@@ -0,0 +1,47 @@
+import itertools
+import random
+
+from organiser.assignment import assign_slots, hungarian
+
+
+def total(cost, pairs):
+    return sum(cost[row][column] for row, column in pairs)
+
+
+def brute_force(cost):
+    rows, columns = len(cost), len(cost[0])
+    if rows <= columns:
+        return min(sum(cost[row][column] for row, column in enumerate(permutation))
+                   for permutation in itertools.permutations(range(columns), rows))
+    return min(sum(cost[row][column] for column, row in enumerate(permutation))
+               for permutation in itertools.permutations(range(rows), columns))
+
+
+def test_hungarian_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        rows, columns = rng.randint(1, 5), rng.randint(1, 5)
+        cost = [[rng.randint(0, 50) for _ in range(columns)] for _ in range(rows)]
+        pairs = hungarian(cost)
+        assert len(pairs) == min(rows, columns)
+        assert len(set(row for row, _ in pairs)) == len(pairs)
+        assert len(set(column for _, column in pairs)) == len(pairs)
+        assert total(cost, pairs) == brute_force(cost)
+
+
+def test_hungarian_empty():
+    assert hungarian([]) == []
+    assert hungarian([[]]) == []
+
+
+def test_assign_slots_keeps_windows_near_their_slots():
+    slots = [{"x": 0, "y": 0, "width": 800, "height": 600},
+             {"x": 1000, "y": 0, "width": 800, "height": 600}]
+    rects = [(995, 3, 800, 600), (2, 1, 800, 600)]
+    assert assign_slots(rects, slots) == {0: 1, 1: 0}
+
+
+def test_assign_slots_with_more_windows_than_slots():
+    slots = [{"x": 0, "y": 0, "width": 800, "height": 600}]
+    rects = [(500, 500, 300, 300), (0, 0, 800, 600)]
+    assert assign_slots(rects, slots) == {1: 0}
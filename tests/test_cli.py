@@ -0,0 +1,40 @@
+import importlib.machinery
+import importlib.util
+import json
+import os
+
+import pytest
+
+from organiser.simulated import SimulatedBackend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    """window-organiser-cli.py (not importable by name because of the hyphens), run in a scratch directory"""
+    monkeypatch.chdir(tmp_path)
+    loader = importlib.machinery.SourceFileLoader("window_organiser_cli", os.path.join(ROOT, "window-organiser-cli.py"))
+    spec = importlib.util.spec_from_loader("window_organiser_cli", loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def test_capture_keeps_configs_it_cannot_use(cli, tmp_path, capsys):
+    broken = {"x": 0, "y": 0, "width": "wide", "height": 600}
+    (tmp_path / "window_config.json").write_text(json.dumps({"Broken": broken}))
+    backend = SimulatedBackend()
+    backend.add_window("Editor", left=10, top=20, width=300, height=200)
+    assert cli.main(["capture", "Editor"], backend) == 0
+    with open(tmp_path / "window_config.json", encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved["Broken"] == broken
+    assert (saved["Editor"]["x"], saved["Editor"]["width"]) == (10, 300)
+
+
+def test_json_flag_after_the_command(cli, capsys):
+    backend = SimulatedBackend()
+    window = backend.add_window("Editor")
+    assert cli.main(["list-windows", "--json"], backend) == 0
+    assert json.loads(capsys.readouterr().out)[0]["handle"] == window._hWnd
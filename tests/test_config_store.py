@@ -0,0 +1,120 @@
+import json
+import time
+
+import pytest
+
+from organiser.config_store import ConfigError, ConfigStore, invalid_reason
+
+RECT = {"x": 0, "y": 0, "width": 800, "height": 600}
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_burst_of_saves_is_written_once(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    store = ConfigStore(str(path), logger, delay=0.1)
+    for i in range(50):
+        store.save_later({f"App {i}": RECT})
+    deadline = time.monotonic() + 5
+    while store.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.2)
+    assert store.writes == 1
+    assert read(path) == {"App 49": RECT}
+
+
+def test_save_later_keeps_the_configs_as_they_were(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    store = ConfigStore(str(path), logger, delay=10)
+    configs = {"App": dict(RECT)}
+    store.save_later(configs)
+    configs["App"]["x"] = 500
+    store.flush()
+    assert read(path) == {"App": RECT}
+
+
+def test_flush_writes_a_pending_save_right_away(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    store = ConfigStore(str(path), logger, delay=10)
+    store.save_later({"App": RECT})
+    assert not path.exists()
+    store.flush()
+    assert read(path) == {"App": RECT}
+    assert store.writes == 1
+    store.flush()
+    assert store.writes == 1
+
+
+def test_save_supersedes_a_pending_save(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    store = ConfigStore(str(path), logger, delay=0.05)
+    store.save_later({"Old": RECT})
+    assert store.save({"New": RECT})
+    time.sleep(0.2)
+    store.flush()
+    assert read(path) == {"New": RECT}
+    assert store.writes == 1
+
+
+def test_older_generation_never_overwrites_newer(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    store = ConfigStore(str(path), logger)
+    assert store.save({"New": RECT})
+    assert store._write(store._generation - 1, json.dumps({"Old": RECT}))
+    assert read(path) == {"New": RECT}
+    assert store.writes == 1
+
+
+def test_write_leaves_no_temporary_files(tmp_path, logger):
+    store = ConfigStore(str(tmp_path / "window_config.json"), logger)
+    store.save({"App": RECT})
+    assert [entry.name for entry in tmp_path.iterdir()] == ["window_config.json"]
+
+
+def test_load_drops_invalid_entries(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    path.write_text(json.dumps({"Good": RECT, "No rect": {"x": 1}, "Slots": {"slots": [RECT, {"x": "0"}]}}))
+    assert ConfigStore(str(path), logger).load() == {"Good": RECT}
+
+
+def test_load_missing_or_empty_file(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    assert ConfigStore(str(path), logger).load() == {}
+    path.write_text("  ")
+    assert ConfigStore(str(path), logger).load() == {}
+
+
+@pytest.mark.parametrize("content", ["{not json", "[1, 2]"])
+def test_load_rejects_broken_files(tmp_path, logger, content):
+    path = tmp_path / "window_config.json"
+    path.write_text(content)
+    with pytest.raises(ConfigError):
+        ConfigStore(str(path), logger).load()
+
+
+def test_load_raw_keeps_entries_load_drops(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    raw = {"Good": RECT, "Typo": {"x": 0, "y": 0, "widht": 800, "height": 600}}
+    path.write_text(json.dumps(raw))
+    store = ConfigStore(str(path), logger)
+    assert store.load_raw() == raw
+    assert store.load() == {"Good": RECT}
+
+
+@pytest.mark.parametrize("extra, reason", [
+    ({"priority": "high"}, "priority must be a number"),
+    ({"weight": None}, "weight must be a number"),
+    ({"priority": True, "weight": "3"}, "priority and weight must be a number"),
+])
+def test_non_numeric_priority_or_weight_is_invalid(extra, reason):
+    assert invalid_reason(dict(RECT, **extra)) == reason
+    assert invalid_reason(dict(RECT, priority=10, weight=2.5)) is None
+
+
+def test_bad_priority_skips_only_that_config(tmp_path, logger):
+    path = tmp_path / "window_config.json"
+    path.write_text(json.dumps({"Good": dict(RECT, priority=5), "Bad": dict(RECT, priority="first")}))
+    assert ConfigStore(str(path), logger).load() == {"Good": dict(RECT, priority=5)}
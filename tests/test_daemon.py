@@ -0,0 +1,70 @@
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from organiser.daemon import DaemonNotRunning, OrganiserDaemon, send_command
+
+
+@pytest.fixture
+def daemon(tmp_path, logger):
+    applied = []
+    daemon = OrganiserDaemon(lambda reason: applied.append(reason) or {"placed": 1}, logger,
+                             state_path=str(tmp_path / "organizer_daemon.json"))
+    daemon.applied = applied
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.stop()
+    thread.join(5)
+
+
+def raw_request(daemon, payload):
+    with socket.create_connection(("127.0.0.1", daemon.port), timeout=5) as sock:
+        sock.sendall(payload + b"\n")
+        with sock.makefile("rb") as reader:
+            return json.loads(reader.readline().decode("utf-8"))
+
+
+def test_state_file_is_written_atomically(daemon, tmp_path):
+    assert os.listdir(tmp_path) == ["organizer_daemon.json"]
+    with open(daemon.state_path, encoding='utf-8') as f:
+        state = json.load(f)
+    assert state["port"] == daemon.port
+    assert state["token"] == daemon.token
+
+
+def test_apply_and_status(daemon):
+    response = send_command("apply", daemon.state_path, reason="test")
+    assert response["ok"]
+    assert response["run"]["placed"] == 1
+    assert daemon.applied == ["test"]
+    assert send_command("status", daemon.state_path)["runs"] == 1
+
+
+@pytest.mark.parametrize("payload", [b"[1]", b'"apply"', b"null", b"not json"])
+def test_bad_requests_get_an_error(daemon, payload):
+    response = raw_request(daemon, payload)
+    assert response["ok"] is False
+    assert response["error"].startswith("Bad request")
+
+
+def test_wrong_token_is_refused(daemon):
+    response = raw_request(daemon, json.dumps({"command": "apply", "token": "guess"}).encode("utf-8"))
+    assert response == {"ok": False, "error": "Invalid token"}
+    assert daemon.applied == []
+
+
+def test_stop_removes_state_file(tmp_path, logger):
+    daemon = OrganiserDaemon(lambda reason: {}, logger, state_path=str(tmp_path / "organizer_daemon.json"))
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    assert send_command("stop", daemon.state_path) == {"ok": True}
+    thread.join(5)
+    assert not os.path.exists(daemon.state_path)
+    with pytest.raises(DaemonNotRunning):
+        send_command("status", daemon.state_path)
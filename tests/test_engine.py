@@ -0,0 +1,110 @@
+import threading
+
+from organiser.engine import OrganiserEngine
+from organiser.launch_cache import LaunchCache
+from organiser.launch_stats import LaunchStats
+from organiser.notifier import Notifier, StubNotifierBackend
+from organiser.scheduler import LaunchScheduler, StaticLoadSignal
+from organiser.simulated import SimulatedApp, SimulatedBackend, SimulatedProcess
+from organiser.watcher import FakeEventSource
+
+
+def make_engine(backend, logger, **kwargs):
+    engine = OrganiserEngine(backend, logger, event_source=backend.event_source,
+                             scheduler=LaunchScheduler(StaticLoadSignal(0.0), poll_interval=0.01), **kwargs)
+    engine.LAUNCH_WAIT = 2
+    engine.POSITION_ONLY_WAIT = 0.3
+    return engine
+
+
+def config(x, **extra):
+    return dict({"x": x, "y": 10, "width": 640, "height": 480}, **extra)
+
+
+def test_open_windows_are_placed_and_rerun_moves_nothing(logger):
+    backend = SimulatedBackend(event_source=FakeEventSource())
+    editor = backend.add_window("Editor")
+    browser = backend.add_window("Browser")
+    configs = {"Editor": config(0, app_name="editor"), "Browser": config(700, app_name="browser")}
+    results = make_engine(backend, logger).run(configs)
+    assert [(result.title, result.success) for result in results] == [("Editor", True), ("Browser", True)]
+    assert editor.rect == (0, 10, 640, 480)
+    assert browser.rect == (700, 10, 640, 480)
+    applied = backend.calls["apply_placements"]
+    results = make_engine(backend, logger).run(configs)
+    assert all(result.details["action"] == "placed" for result in results)
+    assert backend.calls["apply_placements"] == applied
+    assert backend.launches == []
+
+
+def test_launched_app_is_placed_when_its_window_event_arrives(tmp_path, logger):
+    backend = SimulatedBackend(event_source=FakeEventSource())
+    backend.add_app("chat", SimulatedApp("Chat", latency=0.05, final_title="Chat - Friends", rename_after=0.05))
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"), logger)
+    results = make_engine(backend, logger, stats=stats).run({"Friends": config(100, app_name="chat")})
+    assert results[0].success
+    assert backend.launches == ["chat"]
+    assert backend.windows[0].rect == (100, 10, 640, 480)
+    assert len(stats.samples["Friends"]) == 1
+
+
+def test_timed_out_wait_is_counted_not_sampled(tmp_path, logger):
+    backend = SimulatedBackend(event_source=FakeEventSource())
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"), logger)
+    results = make_engine(backend, logger, stats=stats).run({"Missing": config(0, position_only=True)})
+    assert not results[0].success
+    assert stats.timeouts == {"Missing": 1}
+    assert "Missing" not in stats.samples
+
+
+def test_notifier_coalesces_queued_messages():
+    backend = StubNotifierBackend()
+    notifier = Notifier(backend, "Window Organizer", coalesce_delay=0.2)
+    notifier.notify("Starting")
+    notifier.notify("Editor: waiting", key="progress")
+    notifier.notify("Editor: placed", key="progress")
+    notifier.close(2)
+    assert backend.shown == [("Window Organizer", "Starting\nEditor: placed", 3)]
+
+
+class SharedBrowserBackend(SimulatedBackend):
+    """Every launch hands off to one browser process, as PWAs started through msedge_proxy do"""
+
+    browser = None
+
+    def spawn(self, command_line):
+        app = self.apps[command_line]
+        with self._lock:
+            self.launches.append(command_line)
+            if self.browser is None:
+                self.browser = self._create_process()
+            window_pid = self._create_process(parent=self.browser)
+        self._later(app.latency(self.rng), self._appear, app, window_pid)
+        return SimulatedProcess(self.browser)
+
+
+def test_launches_sharing_a_process_family_bind_their_own_windows(logger):
+    backend = SharedBrowserBackend(event_source=FakeEventSource())
+    backend.add_app("whatsapp", SimulatedApp("WhatsApp", latency=0.05))
+    backend.add_app("messenger", SimulatedApp("Messenger", latency=0.4))
+    configs = {"WhatsApp": config(0, app_name="whatsapp", opening_method="whatsapp"),
+               "Messenger": config(700, app_name="messenger", opening_method="messenger")}
+    results = make_engine(backend, logger).run(configs)
+    assert [result.success for result in results] == [True, True]
+    rects = {window.title: window.rect for window in backend.windows}
+    assert rects == {"WhatsApp": (0, 10, 640, 480), "Messenger": (700, 10, 640, 480)}
+
+
+def test_cancelled_wait_keeps_cached_launch_and_stats(tmp_path, logger):
+    backend = SimulatedBackend(event_source=FakeEventSource())
+    backend.add_app("slow", SimulatedApp("Slow", latency=5))
+    cache = LaunchCache(str(tmp_path / "launch_cache.json"), logger)
+    cache.remember("slow", "appopener", "slow", "sim:slow")
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"), logger)
+    engine = make_engine(backend, logger, stats=stats, launch_cache=cache)
+    threading.Timer(0.3, engine.cancel).start()
+    results = engine.run({"Slow": config(0, app_name="slow")})
+    assert not results[0].success
+    assert backend.launches == ["slow"]
+    assert cache.get("slow")["command"] == "sim:slow"
+    assert stats.timeouts == {}
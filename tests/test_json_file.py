@@ -0,0 +1,45 @@
+import json
+import os
+
+import pytest
+
+from organiser.json_file import read_json, write_atomic, write_json
+from organiser.launch_cache import LaunchCache
+
+
+def test_write_json_round_trip_leaves_only_the_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    write_json(path, {"a": [1, 2]})
+    assert read_json(path) == {"a": [1, 2]}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_read_json_missing_or_empty(tmp_path):
+    path = tmp_path / "data.json"
+    assert read_json(str(path)) is None
+    path.write_text(" \n")
+    assert read_json(str(path)) is None
+
+
+def test_failed_write_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"old": True}))
+
+    def refuse(source, destination):
+        raise PermissionError("file in use")
+
+    monkeypatch.setattr(os, "replace", refuse)
+    with pytest.raises(OSError):
+        write_atomic(str(path), "{}")
+    monkeypatch.undo()
+    assert read_json(str(path)) == {"old": True}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_launch_cache_saves_atomically(tmp_path, logger):
+    path = str(tmp_path / "launch_cache.json")
+    cache = LaunchCache(path, logger)
+    cache.remember("discord", "appopener", "discord", "sim:discord")
+    cache.save()
+    assert LaunchCache(path, logger).get("discord")["command"] == "sim:discord"
+    assert os.listdir(tmp_path) == ["launch_cache.json"]
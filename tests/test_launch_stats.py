@@ -0,0 +1,63 @@
+import json
+
+from organiser.launch_stats import LaunchStats, percentile
+
+
+def test_percentile_nearest_rank():
+    assert percentile([5, 1, 3], 50) == 3
+    assert percentile(list(range(1, 21)), 95) == 19
+    assert percentile([2], 95) == 2
+
+
+def test_defaults_until_enough_samples(tmp_path):
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"))
+    stats.record("App", 1.0)
+    assert stats.schedule("App", 10, 1) == (1, 10, 10)
+
+
+def test_schedule_follows_appearance_times(tmp_path):
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"))
+    for seconds in (0.8, 1.0, 1.2, 1.0):
+        stats.record("App", seconds)
+    poll_interval, backoff_after, timeout = stats.schedule("App", 10, 1)
+    assert poll_interval == 0.25
+    assert backoff_after == 1.2
+    assert timeout == 4.4
+
+
+def test_slower_app_recovers_after_timeouts(tmp_path):
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"))
+    for seconds in (0.3, 0.4, 0.5):
+        stats.record("App", seconds)
+    assert stats.schedule("App", 10, 1).timeout == 3.0
+    stats.record_timeout("App")  # Now takes 4 s: the learned deadline is missed
+    assert stats.schedule("App", 10, 1).timeout == 10
+    stats.record_timeout("App")
+    assert stats.schedule("App", 10, 1).timeout == 20
+    stats.record_timeout("App")
+    assert stats.schedule("App", 10, 1).timeout == 10 * LaunchStats.MAX_TIMEOUT_FACTOR
+    stats.record("App", 4.0)
+    assert stats.timeouts == {}
+    assert stats.schedule("App", 10, 1).timeout == 10
+
+
+def test_learned_timeout_is_capped_relative_to_default(tmp_path):
+    stats = LaunchStats(str(tmp_path / "launch_stats.json"))
+    for seconds in (30.0, 40.0, 50.0):
+        stats.record("Slow", seconds)
+    assert stats.schedule("Slow", 10, 1).timeout == 10 * LaunchStats.MAX_TIMEOUT_FACTOR
+
+
+def test_round_trip_and_old_format(tmp_path):
+    path = tmp_path / "launch_stats.json"
+    stats = LaunchStats(str(path))
+    stats.record("App", 1.5)
+    stats.record_timeout("App")
+    stats.save()
+    reloaded = LaunchStats(str(path))
+    assert reloaded.samples == {"App": [1.5]}
+    assert reloaded.timeouts == {"App": 1}
+    path.write_text(json.dumps({"App": [1.0, 2.0]}))
+    old = LaunchStats(str(path))
+    assert old.samples == {"App": [1.0, 2.0]}
+    assert old.timeouts == {}
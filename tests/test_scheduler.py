@@ -0,0 +1,103 @@
+import threading
+import time
+
+from organiser.scheduler import LaunchScheduler, StaticLoadSignal
+
+
+def start_waiting(scheduler, started, name, priority=0, weight=1, cancelled=None, hold=None):
+    """Thread that takes a slot, records ``name`` once admitted and holds the slot until ``hold`` is set"""
+    def run():
+        with scheduler.slot(priority, weight, cancelled) as admitted:
+            started.append((name, admitted))
+            if admitted and hold is not None:
+                hold.wait(5)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_first_launch_is_admitted_even_under_load():
+    scheduler = LaunchScheduler(StaticLoadSignal(1.0), threshold=0.5, poll_interval=0.01)
+    with scheduler.slot(weight=3) as admitted:
+        assert admitted
+        assert scheduler.launching == 1
+        assert scheduler.in_flight == 3
+    assert scheduler.launching == 0
+    assert scheduler.in_flight == 0
+
+
+def test_heavy_launch_waits_for_load_while_light_one_starts():
+    load = StaticLoadSignal(1.0)
+    scheduler = LaunchScheduler(load, threshold=0.5, poll_interval=0.01)
+    started, hold = [], threading.Event()
+    with scheduler.slot():
+        heavy = start_waiting(scheduler, started, "heavy", priority=10, weight=3, hold=hold)
+        time.sleep(0.05)
+        light = start_waiting(scheduler, started, "light", priority=0, weight=1, hold=hold)
+        assert wait_until(lambda: started == [("light", True)])
+        load.value = 0.1
+        assert wait_until(lambda: len(started) == 2)
+    hold.set()
+    heavy.join(2)
+    light.join(2)
+    assert started == [("light", True), ("heavy", True)]
+    assert scheduler.deferrals == 1  # Only the heavy launch had to wait
+
+
+def test_higher_priority_is_admitted_first():
+    scheduler = LaunchScheduler(None, capacity=1, poll_interval=0.01)
+    started, threads = [], []
+    with scheduler.slot():
+        for name, priority in (("low", 0), ("high", 5), ("middle", 2)):
+            threads.append(start_waiting(scheduler, started, name, priority))
+            time.sleep(0.02)
+        assert started == []
+    for thread in threads:
+        thread.join(2)
+    assert [name for name, _ in started] == ["high", "middle", "low"]
+
+
+def test_capacity_caps_weight_in_flight():
+    scheduler = LaunchScheduler(None, capacity=2, poll_interval=0.01)
+    started, hold = [], threading.Event()
+    first = start_waiting(scheduler, started, "first", hold=hold)
+    second = start_waiting(scheduler, started, "second", hold=hold)
+    assert wait_until(lambda: len(started) == 2)
+    third = start_waiting(scheduler, started, "third", hold=hold)
+    time.sleep(0.05)
+    assert len(started) == 2
+    assert scheduler.in_flight == 2
+    hold.set()
+    for thread in (first, second, third):
+        thread.join(2)
+    assert len(started) == 3
+
+
+def test_cancelled_launch_is_not_admitted():
+    scheduler = LaunchScheduler(None, capacity=1, poll_interval=0.01)
+    started, cancelled = [], threading.Event()
+    with scheduler.slot():
+        waiting = start_waiting(scheduler, started, "cancelled", cancelled=cancelled)
+        time.sleep(0.03)
+        cancelled.set()
+        waiting.join(2)
+    assert started == [("cancelled", False)]
+    assert scheduler.launching == 0
+
+
+def test_failing_load_signal_is_ignored(logger):
+    class Broken:
+        def read(self):
+            raise OSError("no /proc")
+
+    scheduler = LaunchScheduler(Broken(), threshold=0.5, logger=logger)
+    assert scheduler.load() == 0.0
+    assert scheduler.load_signal is None
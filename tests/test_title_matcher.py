@@ -0,0 +1,86 @@
+from organiser.simulated import SimulatedBackend
+from organiser.snapshot import DesktopIndex, WindowSnapshot
+from organiser.title_matcher import TitleMatcher
+
+
+def snapshot_of(backend):
+    return WindowSnapshot(backend.get_all_windows())
+
+
+def test_default_rules_match_title_then_original_title(logger):
+    backend = SimulatedBackend()
+    window = backend.add_window("Inbox - Mail")
+    matcher = TitleMatcher({"Mail": {"original_title": "Inbox"}}, backend, logger)
+    match = matcher.assign(snapshot_of(backend))["Mail"]
+    assert match.window is window
+    assert str(match.rule) == "contains 'Mail'"
+
+
+def test_one_window_is_claimed_by_one_config(logger):
+    backend = SimulatedBackend()
+    window = backend.add_window("Chat - Discord")
+    matcher = TitleMatcher({"Discord": {}, "Chat": {}}, backend, logger)
+    assignment = matcher.assign(snapshot_of(backend))
+    assert assignment["Discord"].window is window
+    assert "Chat" not in assignment
+
+
+def test_claimed_window_goes_to_next_config_once_first_is_done(logger):
+    backend = SimulatedBackend()
+    window = backend.add_window("Chat - Discord")
+    matcher = TitleMatcher({"Discord": {}, "Chat": {}}, backend, logger)
+    assignment = matcher.assign(snapshot_of(backend), pending={"Chat"})
+    assert assignment["Chat"].window is window
+
+
+def test_earlier_rule_beats_topmost_window(logger):
+    backend = SimulatedBackend()
+    backend.add_window("notes - Code")
+    exact = backend.add_window("Code")
+    matcher = TitleMatcher({"Editor": {"match": [{"exact": "code"}, {"contains": "Code"}]}}, backend, logger)
+    assert matcher.assign(snapshot_of(backend))["Editor"].window is exact
+
+
+def test_topmost_window_wins_within_a_rule(logger):
+    backend = SimulatedBackend()
+    top = backend.add_window("a - Browser")
+    backend.add_window("b - Browser")
+    matcher = TitleMatcher({"Browser": {"match": {"suffix": " - Browser"}}}, backend, logger)
+    assert matcher.assign(snapshot_of(backend))["Browser"].window is top
+
+
+def test_process_and_class_rules(logger):
+    backend = SimulatedBackend()
+    backend.add_window("Friends", process="Other.exe")
+    discord = backend.add_window("Friends", process="Discord.exe")
+    matcher = TitleMatcher({"Discord": {"match": {"process": "discord.exe"}}}, backend, logger)
+    assert matcher.assign(snapshot_of(backend))["Discord"].window is discord
+
+
+def test_invalid_rule_falls_back_to_title(logger):
+    backend = SimulatedBackend()
+    window = backend.add_window("Terminal")
+    matcher = TitleMatcher({"Terminal": {"match": {"regex": "("}}}, backend, logger)
+    assert matcher.assign(snapshot_of(backend))["Terminal"].window is window
+
+
+def test_matching_windows_skips_windows_claimed_elsewhere(logger):
+    backend = SimulatedBackend()
+    first = backend.add_window("Explorer - Documents")
+    second = backend.add_window("Explorer - Downloads")
+    matcher = TitleMatcher({"Documents": {}, "Explorer": {"slots": []}}, backend, logger)
+    snapshot = snapshot_of(backend)
+    assert matcher.matching_windows(snapshot, "Explorer") == [second]
+    assert matcher.matching_windows(snapshot, "Explorer", pending={"Explorer"}) == [first, second]
+
+
+def test_matcher_uses_snapshot_titles(logger):
+    backend = SimulatedBackend()
+    window = backend.add_window("Loading...")
+    index = DesktopIndex(backend)
+    index.snapshot()
+    matcher = TitleMatcher({"Spotify": {}}, backend, logger)
+    window.title = "Spotify"  # Renamed, but not yet seen by any snapshot
+    assert matcher.assign(index.snapshot()) == {}
+    index.note_window(window._hWnd, "Spotify")
+    assert matcher.assign(index.snapshot())["Spotify"].window is window
@@ -0,0 +1,41 @@
+import json
+import os
+
+from organiser.tracing import Tracer
+
+
+def traced_run(name):
+    tracer = Tracer()
+    with tracer.span(name, title=name):
+        pass
+    tracer.instant("done")
+    return tracer
+
+
+def test_history_is_appended_per_run(tmp_path):
+    path = str(tmp_path / "organizer_trace.jsonl")
+    traced_run("first").append_jsonl(path)
+    traced_run("second").append_jsonl(path)
+    with open(path, encoding='utf-8') as f:
+        names = [json.loads(line)["name"] for line in f]
+    assert names == ["first", "done", "second", "done"]
+
+
+def test_full_history_rotates_and_keeps_backup_count(tmp_path):
+    path = str(tmp_path / "organizer_trace.jsonl")
+    for run in range(6):
+        traced_run(f"run {run}").append_jsonl(path, max_bytes=1, backup_count=3)
+    assert sorted(os.listdir(tmp_path)) == ["organizer_trace.jsonl", "organizer_trace.jsonl.1",
+                                            "organizer_trace.jsonl.2", "organizer_trace.jsonl.3"]
+    with open(path, encoding='utf-8') as f:
+        assert json.loads(f.readline())["name"] == "run 5"
+    with open(f"{path}.3", encoding='utf-8') as f:
+        assert json.loads(f.readline())["name"] == "run 2"
+
+
+def test_export_writes_chrome_trace(tmp_path, logger):
+    trace = str(tmp_path / "organizer_trace.json")
+    traced_run("run").export(trace, str(tmp_path / "organizer_trace.jsonl"), logger)
+    with open(trace, encoding='utf-8') as f:
+        events = json.load(f)["traceEvents"]
+    assert [event["ph"] for event in events if event["ph"] != "M"] == ["X", "i"]
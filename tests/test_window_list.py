@@ -0,0 +1,64 @@
+from organiser.simulated import SimulatedBackend
+from organiser.window_list import WindowListModel, window_pairs
+
+
+def apply_edits(rows, edits):
+    """What a listbox ends up showing after the edits, applied in order"""
+    rows = list(rows)
+    for edit in edits:
+        if edit[0] == "delete":
+            del rows[edit[1]]
+        elif edit[0] == "replace":
+            rows[edit[1]] = edit[2]
+        else:
+            assert edit[1] == len(rows), "inserts are appended"
+            rows.insert(edit[1], edit[2])
+    return rows
+
+
+def test_first_update_inserts_every_window_in_order():
+    model = WindowListModel()
+    edits = model.update([(1, "A"), (2, "B"), (3, "C")])
+    assert edits == [("insert", 0, "A"), ("insert", 1, "B"), ("insert", 2, "C")]
+
+
+def test_unchanged_pairs_produce_no_edits():
+    model = WindowListModel()
+    model.update([(1, "A"), (2, "B")])
+    assert model.update([(1, "A"), (2, "B")]) == []
+
+
+def test_deletes_run_back_to_front_so_indices_stay_valid():
+    model = WindowListModel()
+    shown = apply_edits([], model.update([(1, "A"), (2, "B"), (3, "C"), (4, "D")]))
+    edits = model.update([(2, "B"), (4, "D")])
+    assert edits == [("delete", 2), ("delete", 0)]
+    assert apply_edits(shown, edits) == ["B", "D"]
+
+
+def test_renames_replace_in_place_and_new_windows_are_appended():
+    model = WindowListModel()
+    shown = apply_edits([], model.update([(1, "A"), (2, "B"), (3, "C")]))
+    edits = model.update([(5, "New"), (1, "A"), (2, "B renamed")])
+    assert edits == [("delete", 2), ("replace", 1, "B renamed"), ("insert", 2, "New")]
+    shown = apply_edits(shown, edits)
+    assert shown == ["A", "B renamed", "New"]
+    assert [model.handle_at(index) for index in range(len(shown))] == [1, 2, 5]
+
+
+def test_excluded_titles_are_removed_and_restored():
+    model = WindowListModel()
+    shown = apply_edits([], model.update([(1, "A"), (2, "B")]))
+    shown = apply_edits(shown, model.update(excluded={"A"}))
+    assert shown == ["B"]
+    shown = apply_edits(shown, model.update(excluded=set()))
+    assert shown == ["B", "A"]
+
+
+def test_window_pairs_skips_untitled_windows():
+    backend = SimulatedBackend()
+    first = backend.add_window("Editor")
+    backend.add_window("   ")
+    backend.add_window("")
+    last = backend.add_window("Browser")
+    assert window_pairs(backend) == ((first._hWnd, "Editor"), (last._hWnd, "Browser"))
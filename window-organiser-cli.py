@@ -0,0 +1,159 @@
+import argparse
+import json
+import sys
+import time
+
+from organiser.logs import AsyncLog
+
+CONFIG_FILE = "window_config.json"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Capture and apply window layouts without the GUI")
+    parser.add_argument("--config", default=CONFIG_FILE, help=f"Layout file (default: {CONFIG_FILE})")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    # Also accepted after the command; SUPPRESS keeps a subcommand from resetting what was given before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", default=argparse.SUPPRESS, help=f"Layout file (default: {CONFIG_FILE})")
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Print machine-readable JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture = commands.add_parser("capture", parents=[common], help="Save the current position of open windows")
+    capture.add_argument("titles", nargs="*",
+                         help="Capture windows whose title contains one of these (default: every titled window)")
+    apply = commands.add_parser("apply", parents=[common], help="Launch and position the saved layout")
+    apply.add_argument("--only", nargs="+", metavar="TITLE", help="Only apply these saved configs")
+    apply.add_argument("--max-workers", type=int, default=None, help="Maximum number of apps launched at once")
+    commands.add_parser("list-windows", parents=[common], help="List open windows and their rectangles")
+    commands.add_parser("status", parents=[common], help="Show what apply would do with each saved config")
+    return parser.parse_args(argv)
+
+
+def emit(args, data, text):
+    print(json.dumps(data, indent=2) if args.json else text)
+
+
+def list_windows(args, backend, logger):
+    rows = []
+    for window in backend.get_all_windows():
+        if not (window.title and window.title.strip()):
+            continue
+        try:
+            left, top, width, height = backend.get_window_rect(window._hWnd)
+        except Exception:
+            continue  # Closed while listing
+        rows.append({"handle": window._hWnd, "title": window.title,
+                     "x": left, "y": top, "width": width, "height": height})
+    emit(args, rows, "\n".join(f"{row['handle']:>10}  {row['x']:>6},{row['y']:<6} {row['width']:>5}x{row['height']:<5}  {row['title']}"
+                               for row in rows))
+    return 0
+
+
+def capture(args, backend, logger):
+    from organiser.capture import capture_windows, layout_config
+    from organiser.config_store import ConfigStore
+
+    store = ConfigStore(args.config, logger)
+    configs = store.load_raw()  # Entries apply can't use are written back untouched
+    windows = backend.get_all_windows()
+    needles = [title.upper() for title in args.titles]
+    selected = [(window.title, window._hWnd) for window in windows
+                if window.title and window.title.strip()
+                and (not needles or any(needle in window.title.upper() for needle in needles))]
+    captured = capture_windows(backend, selected, logger, windows)
+    for title, pairs in captured.items():
+        existing = configs.get(title)
+        configs[title] = layout_config(pairs, existing if isinstance(existing, dict) else None)
+        logger.info(f"Captured {title}: {configs[title]}")
+    if captured and not store.save(configs):
+        return 2
+    saved = {title: configs[title] for title in captured}
+    emit(args, saved, "\n".join(f"Captured {title}" for title in saved) or "No matching windows")
+    return 0 if saved else 1
+
+
+def make_engine(backend, logger, max_workers=None):
+    from organiser.engine import OrganiserEngine
+    from organiser.launch_cache import LaunchCache
+    from organiser.launch_stats import LaunchStats
+    from organiser.watcher import WinEventSource
+
+    event_source = WinEventSource() if WinEventSource.available() else None
+    return OrganiserEngine(backend, logger, max_workers=max_workers, event_source=event_source,
+                           stats=LaunchStats("launch_stats.json", logger),
+                           launch_cache=LaunchCache("launch_cache.json", logger))
+
+
+def load_configs(args, logger):
+    from organiser.config_store import ConfigStore
+
+    return ConfigStore(args.config, logger).load()
+
+
+def apply(args, backend, logger, log):
+    from organiser.run_history import RunHistory
+
+    configs = load_configs(args, logger)
+    if args.only:
+        missing = [title for title in args.only if title not in configs]
+        if missing:
+            print(f"Not in {args.config}: {', '.join(missing)}", file=sys.stderr)
+            return 2
+        configs = {title: configs[title] for title in args.only}
+    engine = make_engine(backend, logger, args.max_workers)
+    started_at = time.time()
+    start = time.monotonic()
+    results = engine.run(configs)
+    wall = time.monotonic() - start
+    RunHistory("organizer_history.sqlite", logger).record(results, wall, "cli", started_at)
+    failed = [result.title for result in results if not result.success]
+    if failed:
+        log.dump_debug(f"Failed apps: {', '.join(failed)}")
+    data = {
+        "wall_s": round(wall, 3),
+        "apps": [{"title": result.title, "success": result.success, "elapsed_s": round(result.elapsed, 3),
+                  **(result.details or {})} for result in results],
+    }
+    lines = [f"{'ok' if result.success else 'FAILED':<7} {result.title}" for result in results]
+    lines.append(f"Applied {len(results) - len(failed)}/{len(results)} layouts in {wall:.2f}s")
+    emit(args, data, "\n".join(lines))
+    return 1 if failed else 0
+
+
+def status(args, backend, logger):
+    from organiser.planner import format_plan
+
+    configs = load_configs(args, logger)
+    plan = make_engine(backend, logger).plan(configs)
+    data = [{"title": entry.title, "action": entry.action, "detail": entry.detail,
+             "handles": [window._hWnd for window in entry.windows]} for entry in plan]
+    emit(args, data, format_plan(plan))
+    return 0
+
+
+def main(argv=None, backend=None):
+    """``backend`` defaults to the real desktop; benchmarks pass a simulated one"""
+    args = parse_args(argv)
+    log = AsyncLog("OrganizerCli", 'organizer_cli.log', 'organizer_cli_debug.log')
+    logger = log.logger
+    logger.info(f"=== window-organiser-cli {args.command} ===")
+    try:
+        if backend is None:
+            from organiser.backend import PyGetWindowBackend
+            backend = PyGetWindowBackend()
+        if args.command == "list-windows":
+            return list_windows(args, backend, logger)
+        if args.command == "capture":
+            return capture(args, backend, logger)
+        if args.command == "apply":
+            return apply(args, backend, logger, log)
+        return status(args, backend, logger)
+    except Exception as e:
+        logger.error(f"{args.command} failed: {e}")
+        print(f"{args.command} failed: {e}", file=sys.stderr)
+        return 2
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,18 @@
-import pygetwindow as gw
 import tkinter as tk
 from tkinter import ttk
 import json
 import os
-import logging
-import time
 import subprocess
 import locale
+import queue
+import threading
 
-# Setup logging first, before any other imports
-def setup_initial_logging():
-    """Initialize logging before any other operations"""
-    log_file = 'organizer_config.log'
-    
-    # Clear existing log file
-    with open(log_file, 'w', encoding='utf-8') as f:
-        f.write('')  # Clear the file
-        
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format='%(asctime)s - %(message)s',
-        encoding='utf-8'
-    )
-    return logging.getLogger("OrganizerConfig")
-
-# Initialize logger first
-logger = setup_initial_logging()
+from organiser.logs import AsyncLog
+
+# Setup logging first, before any other imports. Records are written by a
+# background thread so the Tk thread never waits on the log file.
+log = AsyncLog("OrganizerConfig", 'organizer_config.log', 'organizer_config_debug.log')
+logger = log.logger
 logger.info("=== Starting Window Organizer Config ===")
 
 # Now try to import AppOpener
@@ -38,20 +24,81 @@ except Exception as e:
     logger.warning(f"Failed to import AppOpener: {e}")
     APP_OPENER_AVAILABLE = False
 
+from organiser.app_index import AppIndex
+from organiser.backend import PyGetWindowBackend
+from organiser.capture import capture_windows, layout_config, window_info
+from organiser.config_store import ConfigError, ConfigStore, usable_configs
+from organiser.engine import OrganiserEngine
+from organiser.launch_cache import LaunchCache
+from organiser.watcher import WinEventSource
+from organiser.window_list import WindowListModel, window_pairs
+
 class WindowOrganizer:
+    WINDOW_REFRESH_MS = 2000
+
+    APPLY_STATE_COLORS = {
+        'pending': '#888888',
+        'checking': '#cccccc',
+        'queued': '#9E9E9E',
+        'launching': '#FF9800',
+        'waiting': '#FFC107',
+        'positioning': '#2196F3',
+        'done': '#4CAF50',
+        'failed': '#f44336',
+        'cancelled': '#888888',
+    }
+
     def __init__(self):
         self.logger = logger  # Use the already initialized logger
         self.setup_config()
         self.setup_gui()
-        # Get and log available apps at startup
-        self.available_apps = self.get_installed_apps()
-        self.logger.info("\n=== Available Apps ===")
-        for app in sorted(self.available_apps):
-            self.logger.info(f"- {app}")
-        self.logger.info("====================\n")
+        # Worker threads hand results back to Tk through this queue
+        self.ui_queue = queue.Queue()
+        self.root.after(100, self.process_ui_queue)
+        # Show the cached app index straight away and rescan in the background if it is stale
+        self.app_index = AppIndex(self.get_installed_apps, "app_index.json",
+                                  logger=self.logger)
+        self.app_index.load()
+        self.merge_config_apps()
+        self.update_app_count()
         self.refresh_all()
         # Update status bar with app count
         self.status_var.set(f"Ready - {len(self.available_apps)} apps available")
+        self.app_index.refresh_async(lambda changed: self.ui_queue.put(lambda: self.on_app_index_refreshed(changed)))
+        self.root.after(self.WINDOW_REFRESH_MS, self.auto_refresh_windows)
+
+    def process_ui_queue(self):
+        """Run callbacks posted by worker threads on the Tk thread"""
+        try:
+            while True:
+                callback = self.ui_queue.get_nowait()
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"UI callback failed: {e}")
+        except queue.Empty:
+            pass
+        self.root.after(100, self.process_ui_queue)
+
+    def merge_config_apps(self):
+        """List the apps named by the saved configs alongside the scanned ones"""
+        names = []
+        for app_data in self.window_configs.values():
+            if not isinstance(app_data, dict):
+                continue
+            names.extend(app_data[key] for key in ('app_name', 'original_title') if app_data.get(key))
+        self.app_index.merge(names)
+        self.available_apps = self.app_index.apps
+
+    def on_app_index_refreshed(self, changed):
+        """Pick up a freshly scanned app list"""
+        if not changed:
+            return
+        self.available_apps = self.app_index.apps
+        self.logger.info(f"App index refreshed: {len(self.available_apps)} apps")
+        self.logger.debug(f"Available apps: {self.available_apps}")
+        self.update_app_count()
+        self.status_var.set(f"Ready - {len(self.available_apps)} apps available")
 
     def setup_logging(self):
         """Use the already initialized logger"""
@@ -62,7 +109,14 @@ class WindowOrganizer:
 
     def setup_config(self):
         self.config_file = "window_config.json"
+        self.config_store = ConfigStore(self.config_file, self.logger)
         self.window_configs = self.load_config()
+        self.launch_cache = LaunchCache("launch_cache.json", self.logger)
+        self.backend = PyGetWindowBackend()
+        self.apply_engine = None
+        self.apply_states = {}
+        self.window_list = WindowListModel()
+        self.window_scan_running = False
 
     def setup_gui(self):
         # Main window setup
@@ -235,6 +289,7 @@ class WindowOrganizer:
             ("Remove Selected", self.remove_saved, '#f44336')
         ]
         
+        self.buttons = {}
         for i, (text, command, color) in enumerate(buttons):
             btn = tk.Button(button_frame,
                           text=text,
@@ -248,6 +303,7 @@ class WindowOrganizer:
                           cursor='hand2',
                           borderwidth=0)
             btn.grid(row=0, column=i, padx=6, sticky="ew")
+            self.buttons[text] = btn
             
             btn.bind('<Enter>', 
                     lambda e, b=btn, c=color: self.on_button_hover(b, c))
@@ -311,87 +367,99 @@ class WindowOrganizer:
     def load_config(self):
         """Load the configuration file"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    content = f.read().strip()
-                    if content:  # If file is not empty
-                        return json.loads(content)
-                    return {}
-            else:
+            if not os.path.exists(self.config_file):
                 # Only create new file if it doesn't exist
-                with open(self.config_file, 'w') as f:
-                    json.dump({}, f, indent=4)
+                self.config_store.save({})
                 return {}
-        except json.JSONDecodeError as e:
+            # Unusable entries are kept, so saving an edit never deletes a hand-edited config
+            return self.config_store.load_raw()
+        except ConfigError as e:
             self.logger.error(f"Error reading config file: {e}")
             # Backup the broken file instead of overwriting
             if os.path.exists(self.config_file):
                 backup_file = f"{self.config_file}.backup"
-                os.rename(self.config_file, backup_file)
+                os.replace(self.config_file, backup_file)
                 self.logger.info(f"Backed up broken config to {backup_file}")
             # Create new empty config
-            with open(self.config_file, 'w') as f:
-                json.dump({}, f, indent=4)
+            self.config_store.save({})
+            return {}
+        except OSError as e:
+            self.logger.error(f"Error reading config file: {e}")
             return {}
 
     def save_config(self):
-        """Save the configuration file"""
+        """Save the configuration file once edits pause, off the Tk thread"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.window_configs, f, indent=4)
-            self.logger.info(f"Saved config: {self.window_configs}")
+            self.config_store.save_later(self.window_configs)
+            if hasattr(self, 'app_index'):
+                self.merge_config_apps()
+                self.update_app_count()
+            self.logger.info(f"Saved config ({len(self.window_configs)} windows)")
+            self.logger.debug(f"Saved config: {self.window_configs}")
         except Exception as e:
             self.logger.error(f"Failed to save config: {e}")
 
-    def get_window_info(self, window):
-        """Get window information and clean app name"""
-        app_name = window.title.split(" - ")[0].strip()
-        app_mappings = {
-            "WhatsApp": "whatsapp",
-            "Amis": "discord",
-            "Discord": "discord",
-            "Google Chrome": "chrome",
-            "Mozilla Firefox": "firefox",
-            "Microsoft Edge": "edge",
-            "Visual Studio Code": "code",
-            "SPOTIFY PREMIUM": "spotify",
-            "Spotify": "spotify",
-            "Steam": "steam",
-            "Explorateur de fichiers": "explorer",
-            "File Explorer": "explorer",
-            "Messenger": "messenger",
-            "SteelSeries GG": "steelseries-gg",
-            "Mobile connecté": "Mobile connect",
-            "Your Phone": "phone",
-            "Phone Link": "phone",
-        }
-        clean_app_name = app_mappings.get(app_name, app_name.lower())
+    def get_window_info(self, window, rect=None):
+        """Get window information and clean app name; ``rect`` is (left, top, width, height) if already read"""
+        info = window_info(window, rect)
         self.logger.info(f"Original title: {window.title}")
-        self.logger.info(f"Cleaned app name: {clean_app_name}")
-        return {
-            "x": window.left,
-            "y": window.top,
-            "width": window.width,
-            "height": window.height,
-            "app_name": clean_app_name,
-            "original_title": window.title,
-            "position_only": False,
-            "open_method": ""
-        }
+        self.logger.info(f"Cleaned app name: {info['app_name']}")
+        if hasattr(self, 'app_index') and len(self.app_index):
+            self.logger.info(f"Closest installed app: {self.app_index.lookup(info['app_name'])}")
+        return info
 
     def refresh_windows(self):
         """Refresh the active windows list"""
-        self.window_listbox.delete(0, tk.END)
-        for window in gw.getAllWindows():
-            if window.title and window.title.strip():
-                if window.title not in self.window_configs:
-                    self.window_listbox.insert(tk.END, window.title)
+        # Saved windows drop out of the list right away; new windows follow with the scan
+        self.update_window_list()
+        self.request_window_scan()
+
+    def auto_refresh_windows(self):
+        """Keep the active windows list current without user clicks"""
+        self.request_window_scan()
+        self.root.after(self.WINDOW_REFRESH_MS, self.auto_refresh_windows)
+
+    def request_window_scan(self):
+        """Enumerate windows on a worker thread; the list is only touched if something changed"""
+        if self.window_scan_running:
+            return
+        self.window_scan_running = True
+
+        def worker():
+            try:
+                pairs = window_pairs(self.backend)
+            except Exception as e:
+                self.logger.error(f"Window scan failed: {e}")
+                return
+            finally:
+                self.window_scan_running = False
+            if pairs != self.window_list.pairs:
+                self.ui_queue.put(lambda: self.update_window_list(pairs))
+
+        threading.Thread(target=worker, name="window-scan", daemon=True).start()
+
+    def update_window_list(self, pairs=None):
+        """Apply only the rows that changed, keeping the user's selection"""
+        listbox = self.window_listbox
+        for edit in self.window_list.update(pairs, self.window_configs.keys()):
+            if edit[0] == "delete":
+                listbox.delete(edit[1])
+            elif edit[0] == "replace":
+                index, title = edit[1], edit[2]
+                selected = listbox.selection_includes(index)
+                listbox.delete(index)
+                listbox.insert(index, title)
+                if selected:
+                    listbox.selection_set(index)
+            else:
+                listbox.insert(edit[1], edit[2])
 
     def refresh_saved_list(self):
         """Refresh the saved configurations list"""
         self.saved_listbox.delete(0, tk.END)
         for window_title in self.window_configs.keys():
             self.saved_listbox.insert(tk.END, window_title)
+            self.color_saved_row(window_title)
 
     def refresh_all(self):
         """Refresh both lists"""
@@ -405,23 +473,15 @@ class WindowOrganizer:
             self.status_var.set("Please select one or more windows first.")
             return
         saved_count = 0
-        for selection in selections:
-            window_title = self.window_listbox.get(selection)
-            windows = gw.getWindowsWithTitle(window_title)
-            if not windows:
-                self.logger.warning(f"Could not find window: {window_title}")
-                continue
-            window_info = self.get_window_info(windows[0])
-            if window_info:
-                self.logger.info(f"Saving window info: {window_info}")
-                # If already exists, preserve position_only and open_method if present
-                existing = self.window_configs.get(window_title, {})
-                if "position_only" in existing:
-                    window_info["position_only"] = existing["position_only"]
-                if "open_method" in existing:
-                    window_info["open_method"] = existing["open_method"]
-                self.window_configs[window_title] = window_info
-                saved_count += 1
+        # Selected windows sharing a title are saved as one config with a slot per window
+        selected = capture_windows(self.backend, [(self.window_listbox.get(selection), self.window_list.handle_at(selection))
+                                                  for selection in selections], self.logger)
+        for window_title, captured in selected.items():
+            existing = self.window_configs.get(window_title)
+            config = layout_config(captured, existing if isinstance(existing, dict) else None, self.get_window_info)
+            self.logger.info(f"Saving window info: {config}")
+            self.window_configs[window_title] = config
+            saved_count += len(captured)
         self.logger.info(f"Saving {saved_count} windows to config")
         self.save_config()
         self.refresh_all()
@@ -444,66 +504,95 @@ class WindowOrganizer:
         self.status_var.set(f"Removed {len(selections)} configurations")
 
     def apply_layouts(self):
-        """Apply all saved window layouts"""
-        # Get list of available apps from AppOpener
-        available_apps = self.get_installed_apps()
-        self.logger.info(f"Available apps: {available_apps}")
+        """Apply all saved window layouts on a worker thread (or cancel the running apply)"""
+        if self.apply_engine:
+            self.cancel_apply()
+            return
+        if not self.window_configs:
+            self.status_var.set("No saved configurations to apply.")
+            return
+        self.logger.info(f"Available apps: {len(self.available_apps)} indexed")
 
-        for title, config in self.window_configs.items():
-            self.logger.info(f"Applying layout for: {title}")
-            
-            windows = gw.getWindowsWithTitle(title)
-            if not windows:
-                try:
-                    app_name = config["app_name"]
-                    self.logger.info(f"Attempting to launch: {app_name}")
-                    
-                    # Try different methods to launch the app
-                    launch_methods = [
-                        lambda: AppOpener.open(app_name, match_closest=True),
-                        lambda: AppOpener.open(app_name.replace(" ", "-"), match_closest=True),
-                        lambda: AppOpener.open(app_name.replace(" ", ""), match_closest=True),
-                        lambda: os.system(f"start {app_name}")
-                    ]
-
-                    success = False
-                    for method in launch_methods:
-                        try:
-                            method()
-                            success = True
-                            break
-                        except Exception as e:
-                            self.logger.warning(f"Launch attempt failed: {e}")
-                    
-                    if not success:
-                        self.logger.error(f"All launch attempts failed for {app_name}")
-                        continue
-
-                    # Wait for window to appear
-                    for attempt in range(10):
-                        time.sleep(1)
-                        # Try to match both by title and original title
-                        windows = gw.getWindowsWithTitle(title)
-                        if not windows and "original_title" in config:
-                            windows = gw.getWindowsWithTitle(config["original_title"])
-                        if windows:
-                            self.logger.info(f"Window appeared after {attempt + 1}s")
-                            break
-                        self.logger.info(f"Waiting... ({attempt + 1}/10)")
-                except Exception as e:
-                    self.logger.error(f"Failed to launch {title}: {e}")
-                    continue
+        # The worker gets its own copy so saving/removing configs mid-apply is safe
+        configs = usable_configs(self.window_configs, self.logger)
+        if not configs:
+            self.status_var.set("No usable configurations to apply; see the log.")
+            return
+        self.apply_states = {title: "pending" for title in configs}
+        event_source = WinEventSource() if WinEventSource.available() else None
+        engine = OrganiserEngine(
+            self.backend, self.logger,
+            event_source=event_source,
+            launch_cache=self.launch_cache,
+            progress=lambda title, state: self.ui_queue.put(lambda: self.on_apply_progress(title, state))
+        )
+        self.apply_engine = engine
+
+        def worker():
+            try:
+                results = engine.run(configs)
+            except Exception as e:
+                self.logger.error(f"Apply layouts failed: {e}")
+                results = []
+            failed_apps = [result.title for result in results if not result.success]
+            if failed_apps and not engine.cancelled.is_set():
+                # Written here rather than on the Tk thread
+                log.dump_debug(f"Failed apps: {', '.join(failed_apps)}")
+            self.ui_queue.put(lambda: self.on_apply_finished(engine, results))
+
+        threading.Thread(target=worker, name="apply-layouts", daemon=True).start()
+        self.buttons["Apply Layouts"].configure(text="Cancel Apply")
+        self.refresh_saved_list()
+        self.update_apply_status()
 
-            if windows:
-                window = windows[0]
-                try:
-                    window.resizeTo(config["width"], config["height"])
-                    window.moveTo(config["x"], config["y"])
-                    self.logger.info(f"Positioned: {title}")
-                except Exception as e:
-                    self.logger.error(f"Failed to position {title}: {e}")
-            else:
-                self.logger.warning(f"Could not find window: {title}")
+    def cancel_apply(self):
+        """Ask the running apply to stop waiting for windows"""
+        self.apply_engine.cancel()
+        self.status_var.set("Cancelling layout apply...")
+
+    def on_apply_progress(self, title, state):
+        """Show an app's apply state live in the saved list and status bar"""
+        self.apply_states[title] = state
+        self.color_saved_row(title)
+        self.update_apply_status(title)
+
+    def update_apply_status(self, title=None):
+        if not self.apply_engine or self.apply_engine.cancelled.is_set():
+            return
+        states = list(self.apply_states.values())
+        finished = sum(1 for state in states if state in ("done", "failed", "cancelled"))
+        failed = states.count("failed")
+        message = f"Applying layouts: {finished}/{len(states)} finished"
+        if failed:
+            message += f", {failed} failed"
+        if title:
+            message += f" - {title}: {self.apply_states[title]}"
+        self.status_var.set(message)
+
+    def on_apply_finished(self, engine, results):
+        """Restore the Apply button and summarise the run"""
+        if engine is not self.apply_engine:
+            return
+        self.apply_engine = None
+        self.buttons["Apply Layouts"].configure(text="Apply Layouts")
+        self.launch_cache.save()
+        success_count = sum(1 for result in results if result.success)
+        failed_apps = [result.title for result in results if not result.success]
+        if engine.cancelled.is_set():
+            self.status_var.set(f"Apply cancelled - {success_count}/{len(results)} layouts applied")
+        elif failed_apps:
+            self.status_var.set(f"Applied {success_count}/{len(results)} layouts - issue with: {', '.join(failed_apps)}")
+        else:
+            self.status_var.set(f"Applied {success_count}/{len(results)} layouts")
+
+    def color_saved_row(self, title):
+        """Tint a saved configuration row by its apply state"""
+        state = self.apply_states.get(title)
+        if state is None:
+            return
+        rows = self.saved_listbox.get(0, tk.END)
+        if title in rows:
+            self.saved_listbox.itemconfig(rows.index(title), fg=self.APPLY_STATE_COLORS.get(state, self.colors['text']))
 
     def get_installed_apps(self):
         """Get list of installed apps using AppOpener or fallback mechanism"""
@@ -582,19 +671,6 @@ class WindowOrganizer:
                     except Exception as e:
                         self.logger.error(f"Error reading directory {path}: {e}")
 
-            # 4. Add any apps from the current config
-            try:
-                if os.path.exists('window_config.json'):
-                    with open('window_config.json', 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                        for app_data in config.values():
-                            if 'app_name' in app_data:
-                                apps.add(app_data['app_name'])
-                            if 'original_title' in app_data:
-                                apps.add(app_data['original_title'])
-            except Exception as e:
-                self.logger.error(f"Error reading config file: {e}")
-
             # Convert to sorted list and log
             app_list = sorted(apps)
             self.logger.info(f"Successfully retrieved {len(app_list)} apps (including web apps and common applications)")
@@ -607,6 +683,7 @@ class WindowOrganizer:
 def main():
     app = WindowOrganizer()
     app.root.mainloop()
+    app.config_store.flush()  # Don't lose an edit still waiting for its debounced write
 
 if __name__ == "__main__":
     main()
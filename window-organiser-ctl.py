@@ -0,0 +1,31 @@
+import argparse
+import json
+import sys
+
+from organiser.daemon import STATE_FILE, DaemonNotRunning, send_command
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Control a window-organiser.pyw --daemon process")
+    parser.add_argument("command", choices=["apply", "status", "stop"],
+                        help="apply: re-apply the saved layout; status: show daemon state; stop: shut the daemon down")
+    parser.add_argument("--state-file", default=STATE_FILE,
+                        help=f"Daemon state file with its port and token (default: {STATE_FILE})")
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="Seconds to wait for the daemon to answer (default: 120)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        response = send_command(args.command, args.state_file, args.timeout)
+    except (DaemonNotRunning, OSError) as e:
+        print(f"Daemon not reachable: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(response, indent=2))
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+
+from organiser.run_history import RunHistory, distribution, summarise_apps
+
+HISTORY_FILE = "organizer_history.sqlite"
+
+
+def day_start(value):
+    """Unix time of local midnight starting YYYY-MM-DD"""
+    return datetime.datetime.strptime(value, "%Y-%m-%d").timestamp()
+
+
+def date_range(value):
+    """``FROM:TO`` (inclusive days, either side may be empty) as a [since, until) pair of Unix times"""
+    since, _, until = value.partition(":")
+    return (day_start(since) if since else None,
+            day_start(until) + 86400 if until else None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report on past organiser runs recorded in the run history")
+    parser.add_argument("--db", default=HISTORY_FILE, help=f"Run history database (default: {HISTORY_FILE})")
+    parser.add_argument("--since", help="First day to include, YYYY-MM-DD")
+    parser.add_argument("--until", help="Last day to include, YYYY-MM-DD")
+    parser.add_argument("--compare", nargs=2, metavar="FROM:TO",
+                        help="Compare two date ranges, e.g. 2026-09-01:2026-09-30 2026-10-01:")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    return parser.parse_args()
+
+
+def seconds(stats, key):
+    return f"{stats[key]:.2f}" if stats else "-"
+
+
+def rate(stats):
+    return f"{stats['failure_rate']:.0%}" if stats else "-"
+
+
+def report(history, since, until):
+    runs = history.runs(since, until)
+    apps = summarise_apps(history.app_runs(since, until))
+    return {
+        "runs": len(runs),
+        "first": runs[0]["started_at"] if runs else None,
+        "last": runs[-1]["started_at"] if runs else None,
+        "wall_s": distribution([run["wall_s"] for run in runs]),
+        "failed_runs": sum(1 for run in runs if run["succeeded"] < run["apps"]),
+        "apps": apps,
+    }
+
+
+def print_report(summary):
+    if not summary["runs"]:
+        print("No runs recorded in this range")
+        return
+    first = datetime.datetime.fromtimestamp(summary["first"]).strftime("%Y-%m-%d %H:%M")
+    last = datetime.datetime.fromtimestamp(summary["last"]).strftime("%Y-%m-%d %H:%M")
+    wall = summary["wall_s"]
+    print(f"{summary['runs']} runs from {first} to {last}, {summary['failed_runs']} with failures")
+    print(f"Run wall time: p50 {wall['p50']:.2f}s, p95 {wall['p95']:.2f}s, max {wall['max']:.2f}s")
+    print()
+    apps = summary["apps"]
+    width = max([len(title) for title in apps] + [3])
+    print(f"{'app':<{width}} {'runs':>5} {'fail':>6}  {'appear p50':>10} {'p95':>7} {'max':>7}  "
+          f"{'total p50':>9} {'p95':>7} {'max':>7} {'retries':>7}  methods")
+    # Slowest first, so a regressing app is at the top
+    ordered = sorted(apps.items(), key=lambda item: -(item[1]["elapsed_s"] or {"p95": 0})["p95"])
+    for title, stats in ordered:
+        appeared, elapsed = stats["appeared_s"], stats["elapsed_s"]
+        methods = ", ".join(f"{method} x{count}" for method, count in stats["methods"].items())
+        print(f"{title:<{width}} {stats['runs']:>5} {stats['failure_rate']:>6.0%}  {seconds(appeared, 'p50'):>10} "
+              f"{seconds(appeared, 'p95'):>7} {seconds(appeared, 'max'):>7}  {seconds(elapsed, 'p50'):>9} "
+              f"{seconds(elapsed, 'p95'):>7} {seconds(elapsed, 'max'):>7} {stats['retries']:>7}  {methods}")
+
+
+def compare(before, after):
+    """Per-app change between two reports"""
+    changes = {}
+    for title in sorted(set(before["apps"]) | set(after["apps"])):
+        old, new = before["apps"].get(title), after["apps"].get(title)
+        change = {"before": old, "after": new}
+        if old and new and old["elapsed_s"] and new["elapsed_s"]:
+            change["p95_delta_s"] = new["elapsed_s"]["p95"] - old["elapsed_s"]["p95"]
+            change["failure_rate_delta"] = new["failure_rate"] - old["failure_rate"]
+        changes[title] = change
+    return changes
+
+
+def print_comparison(before, after, changes):
+    def wall(summary):
+        return f"{summary['wall_s']['p95']:.2f}s" if summary["wall_s"] else "-"
+
+    print(f"Runs: {before['runs']} -> {after['runs']}, run wall p95: {wall(before)} -> {wall(after)}")
+    print()
+    width = max([len(title) for title in changes] + [3])
+    print(f"{'app':<{width}} {'total p95 before':>16} {'after':>7} {'change':>8}  {'fail before':>11} {'after':>6}")
+    ordered = sorted(changes.items(), key=lambda item: -item[1].get("p95_delta_s", 0))
+    for title, change in ordered:
+        old, new = change["before"], change["after"]
+        delta = f"{change['p95_delta_s']:+.2f}" if "p95_delta_s" in change else "-"
+        print(f"{title:<{width}} {seconds(old and old['elapsed_s'], 'p95'):>16} "
+              f"{seconds(new and new['elapsed_s'], 'p95'):>7} {delta:>8}  "
+              f"{rate(old):>11} {rate(new):>6}")
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.db):
+        print(f"No run history at {args.db}; it is written by window-organiser.pyw after each run", file=sys.stderr)
+        return 2
+    history = RunHistory(args.db)
+    try:
+        if args.compare:
+            before = report(history, *date_range(args.compare[0]))
+            after = report(history, *date_range(args.compare[1]))
+            changes = compare(before, after)
+            if args.json:
+                print(json.dumps({"before": before, "after": after, "changes": changes}, indent=2))
+            else:
+                print_comparison(before, after, changes)
+            return 0
+        summary = report(history, *date_range(f"{args.since or ''}:{args.until or ''}"))
+    except ValueError as e:
+        print(f"Invalid date: {e}", file=sys.stderr)
+        return 2
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,34 @@
 import os
-import sys
 import traceback
 import time
+import threading
 import ctypes
 from ctypes import wintypes
-import subprocess
-import shlex
+import argparse
 
 try:
-    import pygetwindow as gw
-    import json
-    import AppOpener
-    import logging
-    from pathlib import Path
-    from win10toast import ToastNotifier
+    from organiser.logs import AsyncLog
 
-    # Setup logging first thing so we can log any errors
-    log_file = 'organizer_process.log'
-    # Clear existing log file
-    with open(log_file, 'w', encoding='utf-8') as f:
-        f.write('')  # Clear the file
-        
-    logging.basicConfig(
-        filename=log_file,
-        level=logging.INFO,
-        format='%(asctime)s - %(message)s',
-        encoding='utf-8'
-    )
-    logger = logging.getLogger("OrganizerProcess")
+    # Setup logging first thing so we can log any errors. Records are written
+    # by a background thread; the log rotates instead of being cleared per run.
+    log = AsyncLog("OrganizerProcess", 'organizer_process.log', 'organizer_process_debug.log')
+    logger = log.logger
     logger.info("=== New Organization Process Started ===")
 
+    from organiser.backend import PyGetWindowBackend
+    from organiser.config_store import ConfigStore
+    from organiser.engine import OrganiserEngine
+    from organiser.launch_cache import LaunchCache
+    from organiser.launch_stats import LaunchStats
+    from organiser.notifier import Notifier, Win10ToastBackend
+    from organiser.planner import format_plan
+    from organiser.run_history import RunHistory
+    from organiser.tracing import Tracer
+    from organiser.watcher import WinEventSource
+
     def force_exit():
         """Force terminate the current process using Windows API"""
+        log.close()  # Terminating skips atexit, so drain the log queue first
         try:
             pid = os.getpid()
             handle = ctypes.windll.kernel32.OpenProcess(1, False, pid)
@@ -44,307 +41,150 @@ try:
     class WindowOrganiser:
         TOAST_TITLE = "Window Organizer"
         MAX_UI_WAIT_TIME = 30  # Maximum seconds to wait for UI
-
-        def __init__(self):
-            self.logger = logging.getLogger("OrganizerProcess")  # Use the global logger
+        TRACE_FILE = "organizer_trace.json"  # Chrome trace of the latest run
+        TRACE_HISTORY_FILE = "organizer_trace.jsonl"  # Spans of every run, appended and rotated
+        HISTORY_FILE = "organizer_history.sqlite"  # One record per run, see window-organiser-report.py
+        NOTIFY_FLUSH_TIMEOUT = 6  # Max seconds spent at exit showing queued toasts
+
+        def __init__(self, max_workers=None, backend=None, notifier_backend=None):
+            """``backend``/``notifier_backend`` default to the real desktop; benchmarks pass simulated ones"""
+            self.log = log
+            self.logger = log.logger  # Use the global logger
+            self.tracer = Tracer()
+            self.history = RunHistory(self.HISTORY_FILE, self.logger)
             self.config_file = "window_config.json"
+            self.config_store = ConfigStore(self.config_file, self.logger)
+            self.config_mtime = None
+            self.runs = 0
             self.load_config()
+            event_source = WinEventSource() if WinEventSource.available() else None
+            self.backend = backend or PyGetWindowBackend()
+            self.engine = OrganiserEngine(self.backend, self.logger, max_workers=max_workers,
+                                          event_source=event_source,
+                                          stats=LaunchStats("launch_stats.json", self.logger),
+                                          tracer=self.tracer,
+                                          launch_cache=LaunchCache("launch_cache.json", self.logger))
             
-            # Wait for UI to be ready before initializing toaster
-            if not self.wait_for_ui_ready():
+            # Wait for UI to be ready before showing any toast
+            with self.tracer.span("ui wait"):
+                ui_ready = self.wait_for_ui_ready()
+            if not ui_ready:
                 self.logger.error("UI not ready after timeout, exiting...")
                 force_exit()
             
-            self.toaster = ToastNotifier()
+            # Toasts are shown on the notifier's thread; organizing never waits for them
+            self.notifier = Notifier(notifier_backend or Win10ToastBackend(), self.TOAST_TITLE, self.logger, self.tracer)
+            self.finished_apps = 0
+            self.progress_lock = threading.Lock()
 
             self.logger.info("Starting organization process...")
 
         def load_config(self):
             """Load window configurations from JSON"""
             try:
-                if Path(self.config_file).exists():
-                    with open(self.config_file, 'r') as f:
-                        content = f.read().strip()
-                        self.window_configs = json.loads(content) if content else {}
-                else:
-                    self.window_configs = {}
+                if os.path.exists(self.config_file):
+                    self.config_mtime = os.stat(self.config_file).st_mtime_ns
+                self.window_configs = self.config_store.load()
             except Exception as e:
                 self.logger.error(f"Error loading config: {e}")
                 self.window_configs = {}
 
-        def launch_and_wait_for_window(self, title, app_name, original_title=None, max_attempts=10, delay=1, opening_method=None):
-            """Try to launch an app and wait for its window to appear."""
-            if opening_method:
-                self.logger.info(f"Launching {title} using custom opening_method: {opening_method}")
-                try:
-                    cmd_list = shlex.split(opening_method, posix=False)
-                    subprocess.Popen(cmd_list)
-                except Exception as e:
-                    self.logger.error(f"Failed to launch {title} with subprocess: {e}")
-                    return None
-                title_variations = [title]
-                if original_title:
-                    title_variations.append(original_title)
-                max_wait = max_attempts
-            else:
-                launch_methods = [
-                    lambda: AppOpener.open(app_name, match_closest=True),
-                    lambda: AppOpener.open(app_name.replace(" ", "-"), match_closest=True),
-                    lambda: AppOpener.open(app_name.replace(" ", ""), match_closest=True),
-                    lambda: os.system(f"start {app_name}")
-                ]
-                title_variations = [title]
-                if original_title:
-                    title_variations.append(original_title)
-                self.logger.info(f"Attempting to launch {app_name} (original title: {original_title})")
-                launch_success = False
-                for i, method in enumerate(launch_methods):
-                    try:
-                        self.logger.info(f"Launch attempt {i+1} with method: {method.__name__ if hasattr(method, '__name__') else 'lambda'}")
-                        method()
-                        all_windows = gw.getAllWindows()
-                        window_titles = [w.title for w in all_windows if w.title]
-                        self.logger.info(f"Current windows after launch attempt: {window_titles}")
-                        launch_success = True
-                        break
-                    except Exception as e:
-                        self.logger.warning(f"Launch attempt {i+1} failed: {e}")
-                        continue
-                if not launch_success:
-                    self.logger.error(f"All launch attempts failed for {app_name}")
-                    return None
-                max_wait = max_attempts
-
-            # Wait for window to appear
-            for attempt in range(max_wait):
-                time.sleep(delay)
-                for title_var in title_variations:
-                    try:
-                        windows = gw.getWindowsWithTitle(title_var)
-                        if windows:
-                            self.logger.info(f"Window appeared after {attempt + 1}s with title: {title_var}")
-                            return windows[0]
-                    except Exception as e:
-                        self.logger.warning(f"Error getting window {title_var}: {e}")
-                if attempt == 0:
-                    all_windows = gw.getAllWindows()
-                    window_titles = [w.title for w in all_windows if w.title]
-                    self.logger.info(f"Available windows while waiting: {window_titles}")
-                self.logger.info(f"Waiting... ({attempt + 1}/{max_wait})")
-            self.logger.warning(f"Window did not appear after {max_wait} attempts")
-            return None
-
-        def position_window(self, window, config, title):
-            """Position window with a single attempt and simple verification"""
+        def reload_config_if_changed(self):
             try:
-                # Get initial position
-                initial_pos = {
-                    'left': window.left,
-                    'top': window.top,
-                    'width': window.width,
-                    'height': window.height
-                }
-                
-                # Try to position
-                try:
-                    max_attempts = 1
-                    for attempt in range(max_attempts):
-                        try:
-                            if attempt > 0:
-                                # Get fresh handle for retry
-                                windows = gw.getWindowsWithTitle(title)
-                                if not windows:
-                                    self.logger.warning(f"Window disappeared during retry {attempt}")
-                                    return False
-                                window = windows[0]
-                                self.logger.info(f"Retry {attempt} with fresh handle: {window._hWnd}")
-                                time.sleep(0.5)  # Small delay between retries
-                                
-                            window.resizeTo(config["width"], config["height"])
-                            window.moveTo(config["x"], config["y"])
-                            self.logger.info(f"Positioned: {title}")
-                            break
-                        except Exception as e:
-                            if attempt == max_attempts - 1:  # Last attempt
-                                raise  # Re-raise the exception if all attempts failed
-                            self.logger.warning(f"Position attempt {attempt + 1} failed: {e}")
-                            continue
-                except Exception as e:
-                    self.logger.error(f"Failed to position {title}: {e}")
-                    self.logger.error(f"Window state at failure - x={initial_pos['left']}, y={initial_pos['top']}, w={initial_pos['width']}, h={initial_pos['height']}")
-                    return False
-                
-                # Small delay to let window settle
-                time.sleep(0.2)
-                
-                # Simple verification with tolerance
-                try:
-                    # Get fresh window handle
-                    windows = gw.getWindowsWithTitle(title)
-                    if not windows:
-                        self.logger.warning(f"Window disappeared after positioning: {title}")
-                        return False
-                        
-                    window = windows[0]
-                    current_pos = {
-                        'left': window.left,
-                        'top': window.top,
-                        'width': window.width,
-                        'height': window.height
-                    }
-                    
-                    # Check each dimension separately
-                    pos_ok = True
-                    mismatches = []
-                    
-                    if abs(current_pos['left'] - config["x"]) > 2:
-                        mismatches.append(f"X: expected {config['x']}, got {current_pos['left']}")
-                        pos_ok = False
-                    if abs(current_pos['top'] - config["y"]) > 2:
-                        mismatches.append(f"Y: expected {config['y']}, got {current_pos['top']}")
-                        pos_ok = False
-                    if abs(current_pos['width'] - config["width"]) > 2:
-                        mismatches.append(f"Width: expected {config['width']}, got {current_pos['width']}")
-                        pos_ok = False
-                    if abs(current_pos['height'] - config["height"]) > 2:
-                        mismatches.append(f"Height: expected {config['height']}, got {current_pos['height']}")
-                        pos_ok = False
-                    
-                    if pos_ok:
-                        return True
+                mtime = os.stat(self.config_file).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self.config_mtime:
+                self.logger.info("Configuration changed, reloading")
+                self.load_config()
+
+        def organize(self, notify=True, trigger="login"):
+            """Open and organize all windows once and return the per-app results"""
+            if self.runs:
+                # Each run of a resident organiser gets its own trace
+                self.tracer = Tracer()
+                self.engine.set_tracer(self.tracer)
+                self.notifier.tracer = self.tracer
+            self.runs += 1
+            self.finished_apps = 0
+            self.engine.progress = self.on_progress if notify else None
+            results = []
+            started_at = time.time()
+            start = time.monotonic()
+            try:
+                with self.tracer.span("run", apps=len(self.window_configs)):
+                    if notify:
+                        self.notifier.notify("Starting to organize windows...", duration=3)
+                    self.logger.info("Starting window organization")
+                    total_windows = len(self.window_configs)
+
+                    # Apps are launched and positioned concurrently; results come back in config order
+                    results = self.engine.run(self.window_configs)
+                    success_count = sum(1 for result in results if result.success)
+                    failed_apps = [result.title for result in results if not result.success]
+
+                    # Prepare toast message
+                    if not failed_apps:
+                        toast_message = "Window-Organiser completed successfully"
                     else:
-                        self.logger.warning(f"Position verification failed for {title}:")
-                        self.logger.warning(f"Initial position: x={initial_pos['left']}, y={initial_pos['top']}, w={initial_pos['width']}, h={initial_pos['height']}")
-                        self.logger.warning(f"Target position: x={config['x']}, y={config['y']}, w={config['width']}, h={config['height']}")
-                        self.logger.warning(f"Final position: x={current_pos['left']}, y={current_pos['top']}, w={current_pos['width']}, h={current_pos['height']}")
-                        self.logger.warning(f"Mismatches: {', '.join(mismatches)}")
-                        return False
-                        
-                except Exception as e:
-                    self.logger.warning(f"Verification failed for {title}: {e}")
-                    # If verification fails but initial position was different, assume success
-                    if (initial_pos['left'] != config["x"] or 
-                        initial_pos['top'] != config["y"] or 
-                        initial_pos['width'] != config["width"] or 
-                        initial_pos['height'] != config["height"]):
-                        self.logger.info(f"Assuming success for {title} based on position change from initial state")
-                        return True
-                    return False
-                    
+                        toast_message = f"Window-Organiser completed successfully\nMinor issue with: {', '.join(failed_apps)}"
+
+                    if notify:
+                        self.notifier.notify(toast_message, duration=5, key="progress")
+                    self.logger.info(f"Organization process completed. Success: {success_count}/{total_windows}")
+                    if failed_apps:
+                        self.logger.info(f"Failed apps: {', '.join(failed_apps)}")
+                        self.log.dump_debug(f"Failed apps: {', '.join(failed_apps)}")
             except Exception as e:
-                self.logger.error(f"Failed to position {title}: {e}")
-                return False
+                self.logger.error(f"Critical error during organization: {e}")
+                self.logger.debug(traceback.format_exc())
+                self.log.dump_debug(f"Critical error during organization: {e}")
+            finally:
+                self.tracer.export(self.TRACE_FILE, self.TRACE_HISTORY_FILE, self.logger)
+                self.history.record(results, time.monotonic() - start, trigger, started_at)
+            return results
+
+        def on_progress(self, title, state):
+            """Fold per-app completion into a single, continually replaced progress toast"""
+            if state in ("done", "failed", "cancelled"):
+                with self.progress_lock:
+                    self.finished_apps += 1
+                    message = f"Organized {self.finished_apps}/{len(self.window_configs)} windows"
+                self.notifier.notify(message, duration=3, key="progress")
 
         def organize_windows(self):
-            """Open and organize all windows according to saved configuration"""
+            """Open and organize all windows according to saved configuration, then exit"""
             try:
-                self.toaster.show_toast(
-                    self.TOAST_TITLE,
-                    "Starting to organize windows...",
-                    duration=3,
-                    threaded=False
-                )
-                self.logger.info("Starting window organization")
-                success_count = 0
-                total_windows = len(self.window_configs)
-                failed_apps = []  # Track failed apps
-
-                for title, config in self.window_configs.items():
-                    try:
-                        self.logger.info(f"Processing: {title}")
-                        windows = gw.getWindowsWithTitle(title)
-                        position_only = config.get("position_only", False)
-                        open_method = config.get("open_method", "")
-                        opening_method = config.get("opening_method", "")
-                        if position_only:
-                            self.logger.info(f"position_only set for {title}: will not launch, just wait for window (up to 30s)")
-                            for attempt in range(30):
-                                if windows:
-                                    break
-                                time.sleep(1)
-                                windows = gw.getWindowsWithTitle(title)
-                                self.logger.info(f"Waiting for window... ({attempt+1}/30)")
-                        else:
-                            # Use opening_method if specified
-                            if not windows:
-                                window = None
-                                if opening_method:
-                                    window = self.launch_and_wait_for_window(
-                                        title, config["app_name"], config.get("original_title"),
-                                        opening_method=opening_method
-                                    )
-                                elif open_method == "appopener":
-                                    try:
-                                        AppOpener.open(config["app_name"], match_closest=True)
-                                    except Exception as e:
-                                        self.logger.warning(f"AppOpener launch failed: {e}")
-                                elif open_method == "system":
-                                    os.system(f"start {config['app_name']}")
-                                elif open_method.startswith("custom:"):
-                                    cmd = open_method[len("custom:"):]
-                                    os.system(cmd)
-                                elif open_method:
-                                    self.logger.warning(f"Unknown open_method '{open_method}' for {title}, falling back to default.")
-                                else:
-                                    # Default: use current launch logic
-                                    window = self.launch_and_wait_for_window(
-                                        title, config["app_name"], config.get("original_title")
-                                    )
-                                # Wait for window to appear
-                                for attempt in range(10):
-                                    time.sleep(1)
-                                    windows = gw.getWindowsWithTitle(title)
-                                    if not windows and "original_title" in config:
-                                        windows = gw.getWindowsWithTitle(config["original_title"])
-                                    if windows:
-                                        self.logger.info(f"Window appeared after {attempt + 1}s")
-                                        break
-                                    self.logger.info(f"Waiting... ({attempt + 1}/10)")
-                            else:
-                                window = windows[0]
-                        if position_only:
-                            window = windows[0] if windows else None
-                            if window:
-                                if self.position_window(window, config, title):
-                                    success_count += 1
-                                else:
-                                    failed_apps.append(title)
-                            else:
-                                self.logger.warning(f"Could not find window: {title}")
-                                failed_apps.append(title)
-                        else:
-                            if window:
-                                if self.position_window(window, config, title):
-                                    success_count += 1
-                                else:
-                                    failed_apps.append(title)
-                            else:
-                                self.logger.warning(f"Could not find or position window: {title}")
-                                failed_apps.append(title)
-                    except Exception as e:
-                        self.logger.error(f"Error processing window {title}: {e}")
-                        failed_apps.append(title)
-                        continue
-
-                # Prepare toast message
-                if not failed_apps:
-                    toast_message = "Window-Organiser completed successfully"
-                else:
-                    toast_message = f"Window-Organiser completed successfully\nMinor issue with: {', '.join(failed_apps)}"
+                self.organize()
+            finally:
+                self.notifier.close(self.NOTIFY_FLUSH_TIMEOUT)
+                force_exit()
 
-                self.toaster.show_toast(
-                    self.TOAST_TITLE,
-                    toast_message,
-                    duration=5,
-                    threaded=False
+        def apply_for_daemon(self, reason):
+            """Re-apply the layout from warm state for a daemon request"""
+            self.reload_config_if_changed()
+            results = self.organize(notify=False, trigger=reason)
+            return {
+                "apps": len(results),
+                "success": sum(1 for result in results if result.success),
+                "failed": [result.title for result in results if not result.success],
+            }
+
+        def serve(self, port=0, reapply_on_display_change=False):
+            """Organize once, then stay resident and re-apply on request"""
+            try:
+                self.organize(trigger="daemon start")
+                from organiser.daemon import OrganiserDaemon
+                daemon = OrganiserDaemon(
+                    self.apply_for_daemon, self.logger, port=port,
+                    display_signature=self.backend.display_signature if reapply_on_display_change else None
                 )
-                self.logger.info(f"Organization process completed. Success: {success_count}/{total_windows}")
-                if failed_apps:
-                    self.logger.info(f"Failed apps: {', '.join(failed_apps)}")
+                daemon.start().serve_forever()
             except Exception as e:
-                self.logger.error(f"Critical error during organization: {e}")
-                traceback.print_exc(file=sys.stderr)
+                self.logger.error(f"Daemon stopped with an error: {e}")
             finally:
+                self.logger.info("Daemon exiting")
+                self.notifier.close(self.NOTIFY_FLUSH_TIMEOUT)
                 force_exit()
 
         def wait_for_ui_ready(self):
@@ -353,8 +193,7 @@ try:
             while time.time() - start_time < self.MAX_UI_WAIT_TIME:
                 try:
                     # Try to get the desktop window as a test
-                    desktop = ctypes.windll.user32.GetDesktopWindow()
-                    if desktop:
+                    if self.backend.ui_ready():
                         self.logger.info("UI is ready")
                         return True
                 except Exception:
@@ -365,13 +204,43 @@ try:
             self.logger.warning("UI ready timeout reached after 30 seconds")
             return False
 
+    def dry_run():
+        """Print what organizing would do right now, without launching or moving anything"""
+        configs = ConfigStore("window_config.json", logger).load()
+        engine = OrganiserEngine(PyGetWindowBackend(), logger)
+        report = format_plan(engine.plan(configs))
+        logger.info(f"Dry run:\n{report}")
+        print(report)
+
+    def parse_args():
+        parser = argparse.ArgumentParser(description="Open and organize configured windows")
+        parser.add_argument("--max-workers", type=int, default=None,
+                            help=f"Maximum number of apps launched at once (default: {OrganiserEngine.DEFAULT_MAX_WORKERS})")
+        parser.add_argument("--daemon", action="store_true",
+                            help="Stay resident after organizing and accept commands from window-organiser-ctl.py")
+        parser.add_argument("--port", type=int, default=0,
+                            help="Localhost port for daemon commands (default: any free port)")
+        parser.add_argument("--reapply-on-display-change", action="store_true",
+                            help="In daemon mode, re-apply the layout when monitors are added, removed or resized")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Print what each config needs (placed, move, launch, unresolvable) and exit")
+        return parser.parse_args()
+
     def main():
         try:
-            organiser = WindowOrganiser()
-            organiser.organize_windows()
+            args = parse_args()
+            if args.dry_run:
+                dry_run()
+                return
+            organiser = WindowOrganiser(max_workers=args.max_workers)
+            if args.daemon:
+                organiser.serve(args.port, args.reapply_on_display_change)
+            else:
+                organiser.organize_windows()
         except Exception:
             logger.error("Critical error in main:")
             logger.error(traceback.format_exc())
+            log.dump_debug("Critical error in main")
             force_exit()
 
     if __name__ == "__main__":